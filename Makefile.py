@@ -4,6 +4,7 @@ Run with: pymake
 List tasks: pymake list
 """
 
+import functools
 from pathlib import Path
 
 from pymake import sh, task
@@ -18,7 +19,20 @@ ARTIC_DATABASE = OUTPUT_DIR / "artic.duckdb"
 NYPL_DATABASE = OUTPUT_DIR / "nypl.duckdb"
 
 MET_CSV = Path("data/met/MetObjects.csv")
-NGA_OBJECTS = Path("data/nga/data/objects.csv")
+NGA_DATA_DIR = Path("data/nga/data")
+NGA_CSVS = [
+    NGA_DATA_DIR / "objects.csv",
+    NGA_DATA_DIR / "constituents.csv",
+    NGA_DATA_DIR / "objects_constituents.csv",
+    NGA_DATA_DIR / "published_images.csv",
+    NGA_DATA_DIR / "objects_terms.csv",
+]
+
+# Parquet copies of the CSV exports; ingests read these instead of re-parsing CSV.
+PARQUET_CACHE = OUTPUT_DIR / ".cache"
+MET_PARQUET = PARQUET_CACHE / "met" / "MetObjects.parquet"
+NGA_PARQUET_DIR = PARQUET_CACHE / "nga"
+NYPL_ITEMS_PARQUET_DIR = PARQUET_CACHE / "nypl" / "items"
 
 RIJKS_DATA_DIR = Path("data/rijks")
 RIJKS_LIDO_ZIP = RIJKS_DATA_DIR / "202001-rma-lido-collection.zip"
@@ -36,53 +50,126 @@ _RIJKS_ZIPS = [
 ]
 
 
+@functools.cache
+def _pool():
+    from artdig.common import DuckDBPool
+
+    return DuckDBPool()
+
+
+def _conn(path: Path):
+    """Connection to path from the per-run pool; use as a context manager."""
+    return _pool().get(path)
+
+
+def _read_conn(path: Path):
+    """Read-only connection to path, for stats; use as a context manager.
+
+    The read-only instance is kept open for the rest of the run, so stats
+    tasks after the first don't reopen the file. Several processes can hold
+    read-only opens of one file at once.
+    """
+    return _pool().get_read_only(path)
+
+
 @task()
 def submodules():
-    """Update git submodules and pull LFS files."""
-    sh("git submodule update --init --recursive")
-    # LFS smudge: only convert if file is still a pointer (< 1KB)
+    """Update git submodules and pull LFS files.
+
+    Skips the update when `git submodule status` matches the last run.
+    """
+    import hashlib
+
+    def status_sha() -> str:
+        out = sh("git submodule status --recursive", capture=True)
+        return hashlib.sha1(out.encode()).hexdigest()
+
+    stamp = TOUCH_DIR / ".submodules_sha"
+    if not (stamp.exists() and stamp.read_text() == status_sha()):
+        sh("git submodule update --init --recursive")
+        TOUCH_DIR.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(status_sha())
+    _ensure_lfs(MET_CSV)
+
+
+def _ensure_lfs(path: Path):
+    """Smudge path if it is still an LFS pointer file.
+
+    A stat and a 100-byte read decide this, so a smudged file costs no
+    subprocess.
+    """
+    if not path.exists() or path.stat().st_size >= 1024:
+        return
+    with open(path, "rb") as f:
+        if not f.read(100).startswith(b"version https://git-lfs.github.com/spec/v1"):
+            return
     sh(
-        "cd data/met && "
-        "if [ $(wc -c < MetObjects.csv) -lt 1000 ]; then "
+        f"cd {path.parent} && "
         "git lfs fetch origin master && "
-        "git lfs smudge < MetObjects.csv > MetObjects_real.csv && "
-        "mv MetObjects_real.csv MetObjects.csv; "
-        "fi"
+        f"git lfs smudge < {path.name} > {path.name}.real && "
+        f"mv {path.name}.real {path.name}"
     )
 
 
+def _convert_csvs(pairs: list[tuple[Path, Path]]):
+    """Convert each (csv, parquet) pair whose CSV is newer than its Parquet copy."""
+    import duckdb
+
+    from artdig.common import export_to_parquet
+
+    conn = duckdb.connect()
+    try:
+        for csv, dest in pairs:
+            if dest.exists() and dest.stat().st_mtime >= csv.stat().st_mtime:
+                continue
+            print(f"  {csv} -> {dest}")
+            export_to_parquet(conn, csv, dest)
+    finally:
+        conn.close()
+
+
+@task(inputs=[submodules, MET_CSV], outputs=[MET_PARQUET])
+def convert_met_to_parquet():
+    """Convert the Met CSV export to Parquet under output/.cache."""
+    _convert_csvs([(MET_CSV, MET_PARQUET)])
+
+
+@task(
+    inputs=[submodules, *NGA_CSVS],
+    outputs=[NGA_PARQUET_DIR / f"{c.stem}.parquet" for c in NGA_CSVS],
+)
+def convert_nga_to_parquet():
+    """Convert NGA CSV exports to Parquet under output/.cache.
+
+    Only files whose CSV is newer than the Parquet copy are converted.
+    """
+    _convert_csvs([(c, NGA_PARQUET_DIR / f"{c.stem}.parquet") for c in NGA_CSVS])
+
+
 @task(
-    inputs=[submodules, MET_CSV],
+    inputs=[convert_met_to_parquet],
     touch=TOUCH_DIR / "ingest_met",
 )
 def ingest_met():
-    """Ingest Met Museum CSV into output/met.duckdb."""
+    """Ingest Met Museum CSV (via its Parquet cache) into output/met.duckdb."""
     TOUCH_DIR.mkdir(parents=True, exist_ok=True)
-    from artdig.common import open_db
     from artdig.met.ingest import MetIngester
 
-    conn = open_db(MET_DATABASE)
-    try:
-        MetIngester(conn).run()
-    finally:
-        conn.close()
+    with _conn(MET_DATABASE) as conn:
+        MetIngester(conn, MET_PARQUET).run()
 
 
 @task(
-    inputs=[submodules, NGA_OBJECTS],
+    inputs=[convert_nga_to_parquet],
     touch=TOUCH_DIR / "ingest_nga",
 )
 def ingest_nga():
-    """Ingest NGA CSVs into output/nga.duckdb."""
+    """Ingest NGA CSVs (via their Parquet cache) into output/nga.duckdb."""
     TOUCH_DIR.mkdir(parents=True, exist_ok=True)
-    from artdig.common import open_db
     from artdig.nga.ingest import NgaIngester
 
-    conn = open_db(NGA_DATABASE)
-    try:
-        NgaIngester(conn).run()
-    finally:
-        conn.close()
+    with _conn(NGA_DATABASE) as conn:
+        NgaIngester(conn, NGA_PARQUET_DIR, suffix=".parquet").run()
 
 
 @task()
@@ -92,61 +179,74 @@ def ingest_getty(
     max_pages: int | None = None,
     max_objects: int | None = None,
     sleep_seconds: float = 0.02,
+    concurrency: int = 8,
 ):
     """Ingest Getty ActivityStream + objects into output/getty.duckdb."""
-    from artdig.common import open_db
     from artdig.getty.ingest import GettyConfig, GettyIngester
 
-    conn = open_db(GETTY_DATABASE)
-    try:
+    with _conn(GETTY_DATABASE) as conn:
         cfg = GettyConfig(
             from_page=from_page,
             to_page=to_page,
             max_pages=max_pages,
             max_objects=max_objects,
             sleep_seconds=sleep_seconds,
+            concurrency=concurrency,
         )
         GettyIngester(conn).run(cfg)
-    finally:
-        conn.close()
 
 
-@task(outputs=[RIJKS_LIDO_ZIP])
-def download_rijks():
-    """Download Rijksmuseum historical data dumps from GitHub."""
-    import urllib.request
+@task()
+def download_rijks(workers: int = 4, connections: int = 8):
+    """Download Rijksmuseum historical data dumps from GitHub.
+
+    Zips are fetched concurrently; interrupted downloads resume from
+    their .part file on the next run. Zips already present are
+    revalidated with a conditional GET instead of skipped, so the task
+    has no outputs and runs every time.
+    Each new zip is fetched over `connections` parallel byte ranges.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from artdig.common import download
 
     RIJKS_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    for name in _RIJKS_ZIPS:
-        dest = RIJKS_DATA_DIR / name
-        if dest.exists():
-            print(f"  skip {name} (exists)")
-            continue
-        url = f"{_RIJKS_RELEASE}/{name}"
+
+    def fetch(name: str):
         print(f"  downloading {name} ...")
-        urllib.request.urlretrieve(url, dest)
-        print(f"  saved {dest} ({dest.stat().st_size / 1e6:.0f} MB)")
+        dest = download(
+            f"{_RIJKS_RELEASE}/{name}", RIJKS_DATA_DIR / name, connections=connections
+        )
+        if dest is None:
+            print(f"  {name} not modified")
+        else:
+            print(f"  saved {dest} ({dest.stat().st_size / 1e6:.0f} MB)")
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(fetch, _RIJKS_ZIPS))
 
 
 @task(
     inputs=[download_rijks, RIJKS_LIDO_ZIP],
     touch=TOUCH_DIR / "ingest_rijks_lido",
 )
-def ingest_rijks_lido(batch_size: int = 5000):
+def ingest_rijks_lido(batch_size: int = 5000, workers: int | None = None):
     """Ingest Rijksmuseum LIDO XML dump (~694k records) into output/rijks.duckdb.
 
     Replaces rijks_objects table with LIDO-derived schema.
     Preserves OAI-PMH tables (sets, harvest_state, object_sets).
+    XML parsing runs in `workers` processes (default: CPU count).
     """
     TOUCH_DIR.mkdir(parents=True, exist_ok=True)
-    from artdig.common import open_db
     from artdig.rijks.ingest import RijksIngester
 
-    conn = open_db(RIJKS_DATABASE)
-    try:
-        RijksIngester(conn).ingest_lido(RIJKS_LIDO_ZIP, batch_size=batch_size)
-    finally:
-        conn.close()
+    with _conn(RIJKS_DATABASE) as conn:
+        RijksIngester(conn).ingest_lido(
+            RIJKS_LIDO_ZIP, batch_size=batch_size, workers=workers
+        )
+        # Refresh optimizer statistics and compact row groups for later scans.
+        conn.execute("ANALYZE")
+        conn.execute("CHECKPOINT")
 
 
 @task()
@@ -161,11 +261,9 @@ def ingest_rijks(
     Supports resumption — safe to interrupt and restart.
     Skips objects already in the DB (only adds set memberships).
     """
-    from artdig.common import open_db
     from artdig.rijks.ingest import RijksConfig, RijksIngester
 
-    conn = open_db(RIJKS_DATABASE)
-    try:
+    with _conn(RIJKS_DATABASE) as conn:
         cfg = RijksConfig(
             set_spec=set,
             max_pages=max_pages,
@@ -173,25 +271,28 @@ def ingest_rijks(
             resume=resume,
         )
         RijksIngester(conn).run(cfg)
-    finally:
-        conn.close()
+        # Refresh optimizer statistics and compact row groups for later scans.
+        conn.execute("ANALYZE")
+        conn.execute("CHECKPOINT")
 
 
 @task()
 def rijks_list_sets():
     """List Rijksmuseum OAI-PMH sets with object counts (syncs from API first)."""
-    from artdig.common import open_db
     from artdig.rijks.ingest import RijksIngester
 
-    conn = open_db(RIJKS_DATABASE)
-    try:
+    with _conn(RIJKS_DATABASE) as conn:
         RijksIngester(conn).sync_sets()
         rows = conn.execute("""
+            WITH counts AS (
+                SELECT set_spec, count(*) AS n
+                FROM rijks_object_sets
+                GROUP BY set_spec
+            )
             SELECT s.set_spec, s.set_name, s.record_count,
-                   count(os.identifier) AS n
+                   COALESCE(c.n, 0) AS n
             FROM rijks_sets s
-            LEFT JOIN rijks_object_sets os ON s.set_spec = os.set_spec
-            GROUP BY s.set_spec, s.set_name, s.record_count
+            LEFT JOIN counts c USING (set_spec)
             ORDER BY n DESC, s.set_spec
         """).fetchall()
         print(f"{'set':>10}  {'total':>7}  {'local':>6}  name")
@@ -200,230 +301,311 @@ def rijks_list_sets():
             total = f"{record_count:,}" if record_count else "?"
             local = f"{n:,}" if n > 0 else "-"
             print(f"{spec:>10}  {total:>7}  {local:>6}  {name}")
-    finally:
-        conn.close()
 
 
 @task()
 def rijks_probe_sizes(sleep_seconds: float = 0.2):
     """Probe each Rijks set with one OAI-PMH request to get record counts."""
-    from artdig.common import open_db
     from artdig.rijks.ingest import RijksIngester
 
-    conn = open_db(RIJKS_DATABASE)
-    try:
+    with _conn(RIJKS_DATABASE) as conn:
         RijksIngester(conn).probe_set_sizes(sleep_seconds=sleep_seconds)
-    finally:
-        conn.close()
 
 
 @task()
 def reparse_rijks():
     """Re-parse all Rijks objects from stored raw XML (no network)."""
-    from artdig.common import open_db
     from artdig.rijks.ingest import RijksIngester
 
-    conn = open_db(RIJKS_DATABASE)
-    try:
+    with _conn(RIJKS_DATABASE) as conn:
         RijksIngester(conn).reparse()
-    finally:
-        conn.close()
 
 
 @task()
 def stats_rijks():
     """Print basic stats for the Rijksmuseum-only database."""
-    from artdig.common import open_db
-
-    conn = open_db(RIJKS_DATABASE)
-    try:
+    with _read_conn(RIJKS_DATABASE) as conn:
         rows = conn.execute("""
             SELECT
                 count(*) AS objects,
-                count(*) FILTER (WHERE image_url IS NOT NULL) AS with_image,
-                count(*) FILTER (WHERE creator_name IS NOT NULL) AS with_creator,
-                count(*) FILTER (WHERE earliest_year IS NOT NULL) AS with_date,
-                count(*) FILTER (WHERE height_cm IS NOT NULL) AS with_dimensions
+                count(image_url) AS with_image,
+                count(creator_name) AS with_creator,
+                count(earliest_year) AS with_date,
+                count(height_cm) AS with_dimensions
             FROM rijks_objects
         """).fetchone()
-        print("=== Rijksmuseum Dataset ===")
-        print(f"  db: {RIJKS_DATABASE}")
-        print(f"  objects: {rows[0]:,}")
-        print(f"  with image: {rows[1]:,}")
-        print(f"  with creator: {rows[2]:,}")
-        print(f"  with date: {rows[3]:,}")
-        print(f"  with dimensions: {rows[4]:,}")
-    finally:
-        conn.close()
+        print(
+            "=== Rijksmuseum Dataset ===",
+            f"  db: {RIJKS_DATABASE}",
+            f"  objects: {rows[0]:,}",
+            f"  with image: {rows[1]:,}",
+            f"  with creator: {rows[2]:,}",
+            f"  with date: {rows[3]:,}",
+            f"  with dimensions: {rows[4]:,}",
+            sep="\n",
+        )
+
+
+@task()
+def reparse_getty():
+    """Re-derive Getty object columns from stored raw JSON (no network)."""
+    from artdig.getty.ingest import GettyIngester
+
+    with _conn(GETTY_DATABASE) as conn:
+        GettyIngester(conn).reparse()
 
 
 @task()
 def ingest_getty_index():
     """Build Getty object index from SPARQL into output/getty.duckdb."""
-    from artdig.common import open_db
     from artdig.getty.ingest import GettyIngester
 
-    conn = open_db(GETTY_DATABASE)
-    try:
+    with _conn(GETTY_DATABASE) as conn:
         GettyIngester(conn).build_object_index_from_sparql()
-    finally:
-        conn.close()
 
 
 @task()
 def ingest_getty_pending(
     limit: int = 1000,
     sleep_seconds: float = 0.02,
+    concurrency: int = 8,
 ):
-    """Hydrate pending Getty object URLs from index."""
-    from artdig.common import open_db
+    """Hydrate pending Getty object URLs from index, `concurrency` fetches at a time."""
     from artdig.getty.ingest import GettyIngester
 
-    conn = open_db(GETTY_DATABASE)
-    try:
-        GettyIngester(conn).hydrate_pending_objects(limit=limit, sleep_seconds=sleep_seconds)
-    finally:
-        conn.close()
+    with _conn(GETTY_DATABASE) as conn:
+        GettyIngester(conn).hydrate_pending_objects(
+            limit=limit, sleep_seconds=sleep_seconds, concurrency=concurrency
+        )
+        # Refresh optimizer statistics and compact row groups for later scans.
+        conn.execute("ANALYZE")
+        conn.execute("CHECKPOINT")
+
+
+@task()
+def download_artic(connections: int = 8):
+    """Download ARTIC data dump from S3 over `connections` parallel byte ranges.
 
+    An archive already present is revalidated with a conditional GET, and
+    re-extracted when the server sends a new one.
 
-@task(outputs=[ARTIC_DATA_DIR / "artic-api-data.tar.bz2"])
-def download_artic():
-    """Download ARTIC data dump from S3."""
+    Extraction pipes through lbzip2/pbzip2 when available so bz2
+    decompression runs on all cores instead of one.
+    """
+    import shlex
+    import shutil
     import tarfile
-    import urllib.request
+
+    from artdig.common import download
 
     ARTIC_DATA_DIR.mkdir(parents=True, exist_ok=True)
     archive = ARTIC_DATA_DIR / "artic-api-data.tar.bz2"
-    if archive.exists():
-        print(f"  skip download (exists: {archive})")
-    else:
-        print(f"  downloading {ARTIC_DUMP_URL} ...")
-        urllib.request.urlretrieve(ARTIC_DUMP_URL, archive)
+    print(f"  downloading {ARTIC_DUMP_URL} ...")
+    fetched = download(ARTIC_DUMP_URL, archive, connections=connections) is not None
+    if fetched:
         print(f"  saved {archive} ({archive.stat().st_size / 1e6:.0f} MB)")
+    else:
+        print("  not modified")
     marker = ARTIC_DATA_DIR / "artic-api-data" / "getting-started" / "allArtworks.jsonl"
-    if not marker.exists():
+    if fetched or not marker.exists():
         print("  extracting archive ...")
-        with tarfile.open(archive, "r:bz2") as tf:
-            tf.extractall(ARTIC_DATA_DIR)
+        bunzip = next(
+            (b for b in ("lbzip2", "pbzip2", "bzip2") if shutil.which(b)), None
+        )
+        if bunzip:
+            # pipefail: a failed decompressor must fail the task, not leave
+            # tar to exit cleanly on a truncated stream.
+            src, dest = shlex.quote(str(archive)), shlex.quote(str(ARTIC_DATA_DIR))
+            sh(["bash", "-o", "pipefail", "-c", f"{bunzip} -dc {src} | tar -x -C {dest}"])
+        else:
+            with tarfile.open(archive, "r:bz2") as tf:
+                tf.extractall(ARTIC_DATA_DIR)
         print("  extraction complete")
 
 
 @task(inputs=[download_artic], touch=TOUCH_DIR / "ingest_artic")
-def ingest_artic():
-    """Ingest ARTIC data dump into output/artic.duckdb."""
+def ingest_artic(mode: str = "replace"):
+    """Ingest ARTIC data dump into output/artic.duckdb.
+
+    mode=replace reloads the table; mode=append only adds new ids;
+    mode=incremental only adds ids above the last run's max(id);
+    mode=changed reloads only files modified since they were ingested.
+    """
     TOUCH_DIR.mkdir(parents=True, exist_ok=True)
     from artdig.artic.ingest import ArticIngester
-    from artdig.common import open_db
-
-    conn = open_db(ARTIC_DATABASE)
-    try:
-        ArticIngester(conn, ARTIC_DATA_DIR).run()
-    finally:
-        conn.close()
+    with _conn(ARTIC_DATABASE) as conn:
+        ArticIngester(conn, ARTIC_DATA_DIR, mode=mode).run()
 
 
 @task()
 def stats_artic():
     """Print basic stats for the ARTIC database."""
-    from artdig.common import open_db
-
-    conn = open_db(ARTIC_DATABASE)
-    try:
+    with _read_conn(ARTIC_DATABASE) as conn:
         rows = conn.execute("""
             SELECT
                 count(*) AS objects,
-                count(*) FILTER (WHERE image_url IS NOT NULL) AS with_image,
-                count(*) FILTER (WHERE artist_name IS NOT NULL) AS with_artist,
-                count(*) FILTER (WHERE date_start IS NOT NULL) AS with_date,
+                count(image_url) AS with_image,
+                count(artist_name) AS with_artist,
+                count(date_start) AS with_date,
                 count(*) FILTER (WHERE is_public_domain) AS public_domain
             FROM artic_objects
         """).fetchone()
-        print("=== Art Institute of Chicago Dataset ===")
-        print(f"  db: {ARTIC_DATABASE}")
-        print(f"  objects: {rows[0]:,}")
-        print(f"  with image: {rows[1]:,}")
-        print(f"  with artist: {rows[2]:,}")
-        print(f"  with date: {rows[3]:,}")
-        print(f"  public domain: {rows[4]:,}")
-    finally:
-        conn.close()
+        print(
+            "=== Art Institute of Chicago Dataset ===",
+            f"  db: {ARTIC_DATABASE}",
+            f"  objects: {rows[0]:,}",
+            f"  with image: {rows[1]:,}",
+            f"  with artist: {rows[2]:,}",
+            f"  with date: {rows[3]:,}",
+            f"  public domain: {rows[4]:,}",
+            sep="\n",
+        )
 
 
 @task(inputs=[ingest_met, ingest_nga])
 def ingest():
-    """Run all ingestion tasks."""
+    """Run all ingestion tasks.
+
+    Met and NGA write separate databases, so `pymake -j2 ingest` loads
+    them concurrently in one process.
+    """
     pass
 
 
 @task()
 def stats_getty():
     """Print basic stats for the Getty-only database."""
-    from artdig.common import open_db
-
-    conn = open_db(GETTY_DATABASE)
-    try:
+    with _read_conn(GETTY_DATABASE) as conn:
         rows = conn.execute("""
             SELECT
                 count(*) AS objects,
-                count(*) FILTER (WHERE image_url IS NOT NULL) AS with_image,
-                count(*) FILTER (WHERE iiif_manifest_url IS NOT NULL) AS with_manifest,
+                count(image_url) AS with_image,
+                count(iiif_manifest_url) AS with_manifest,
                 count(*) FILTER (WHERE is_metadata_cc0) AS metadata_cc0
             FROM getty_objects
         """).fetchone()
-        print("=== Getty Dataset ===")
-        print(f"  db: {GETTY_DATABASE}")
-        print(f"  objects: {rows[0]:,}")
-        print(f"  with image: {rows[1]:,}")
-        print(f"  with manifest: {rows[2]:,}")
-        print(f"  metadata cc0: {rows[3]:,}")
+        print(
+            "=== Getty Dataset ===",
+            f"  db: {GETTY_DATABASE}",
+            f"  objects: {rows[0]:,}",
+            f"  with image: {rows[1]:,}",
+            f"  with manifest: {rows[2]:,}",
+            f"  metadata cc0: {rows[3]:,}",
+            sep="\n",
+        )
+
+
+@task(inputs=[NYPL_DATA_DIR / "items"], outputs=[NYPL_ITEMS_PARQUET_DIR])
+def convert_nypl_to_parquet():
+    """Convert each NYPL items NDJSON file to its own Parquet under output/.cache.
+
+    Files are converted one at a time, so memory stays bounded by the
+    largest file rather than the whole dump. Only files whose NDJSON is
+    newer than their Parquet copy are converted; copies whose NDJSON is
+    gone are removed.
+    """
+    import duckdb
+
+    from artdig.common import export_to_parquet
+
+    items = sorted((NYPL_DATA_DIR / "items").glob("*.ndjson"))
+    keep = {NYPL_ITEMS_PARQUET_DIR / f"{p.stem}.parquet" for p in items}
+    for stale in set(NYPL_ITEMS_PARQUET_DIR.glob("*.parquet")) - keep:
+        stale.unlink()
+    conn = duckdb.connect()
+    try:
+        for src in items:
+            dest = NYPL_ITEMS_PARQUET_DIR / f"{src.stem}.parquet"
+            if dest.exists() and dest.stat().st_mtime >= src.stat().st_mtime:
+                continue
+            print(f"  {src} -> {dest}")
+            export_to_parquet(conn, src, dest)
     finally:
         conn.close()
 
 
-@task(inputs=[NYPL_DATA_DIR / "items"], touch=TOUCH_DIR / "ingest_nypl")
+@task(inputs=[convert_nypl_to_parquet], touch=TOUCH_DIR / "ingest_nypl")
 def ingest_nypl():
-    """Ingest NYPL public-domain data dump into output/nypl.duckdb."""
+    """Ingest NYPL data dump (items via their Parquet cache) into output/nypl.duckdb."""
     TOUCH_DIR.mkdir(parents=True, exist_ok=True)
-    from artdig.common import open_db
     from artdig.nypl.ingest import NYPLIngester
 
-    conn = open_db(NYPL_DATABASE)
-    try:
-        NYPLIngester(conn, NYPL_DATA_DIR).run()
-    finally:
-        conn.close()
+    with _conn(NYPL_DATABASE) as conn:
+        NYPLIngester(conn, NYPL_DATA_DIR, NYPL_ITEMS_PARQUET_DIR / "*.parquet").run()
 
 
 @task()
 def stats_nypl():
     """Print basic stats for the NYPL database."""
-    from artdig.common import open_db
-
-    conn = open_db(NYPL_DATABASE)
-    try:
+    with _read_conn(NYPL_DATABASE) as conn:
         rows = conn.execute("""
             SELECT
                 count(*) AS objects,
-                count(*) FILTER (WHERE image_url IS NOT NULL) AS with_image,
-                count(*) FILTER (WHERE artist_name IS NOT NULL) AS with_artist,
-                count(*) FILTER (WHERE date_start IS NOT NULL) AS with_date,
+                count(image_url) AS with_image,
+                count(artist_name) AS with_artist,
+                count(date_start) AS with_date,
                 count(DISTINCT collection_uuid) AS collections
             FROM nypl_objects
         """).fetchone()
-        print("=== NYPL Public Domain Dataset ===")
-        print(f"  db: {NYPL_DATABASE}")
-        print(f"  objects: {rows[0]:,}")
-        print(f"  with image: {rows[1]:,}")
-        print(f"  with artist: {rows[2]:,}")
-        print(f"  with date: {rows[3]:,}")
-        print(f"  collections: {rows[4]:,}")
-
         coll_count = conn.execute(
             "SELECT count(*) FROM nypl_collections"
         ).fetchone()[0]
-        print(f"  collection records: {coll_count:,}")
+        print(
+            "=== NYPL Public Domain Dataset ===",
+            f"  db: {NYPL_DATABASE}",
+            f"  objects: {rows[0]:,}",
+            f"  with image: {rows[1]:,}",
+            f"  with artist: {rows[2]:,}",
+            f"  with date: {rows[3]:,}",
+            f"  collections: {rows[4]:,}",
+            f"  collection records: {coll_count:,}",
+            sep="\n",
+        )
+
+
+@task()
+def stats_all():
+    """Print object counts for every built database in one query.
+
+    The databases are ATTACHed read-only to one in-memory connection so
+    the counts run as a single plan.
+    """
+    import duckdb
+
+    from artdig.common import sql_string
+
+    sources = [
+        ("met", MET_DATABASE, "met_objects"),
+        ("nga", NGA_DATABASE, "nga_objects"),
+        ("getty", GETTY_DATABASE, "getty_objects"),
+        ("rijks", RIJKS_DATABASE, "rijks_objects"),
+        ("artic", ARTIC_DATABASE, "artic_objects"),
+        ("nypl", NYPL_DATABASE, "nypl_objects"),
+    ]
+    sources = [s for s in sources if s[1].exists()]
+    if not sources:
+        print("No databases found in output/")
+        return
+
+    conn = duckdb.connect()
+    try:
+        for alias, path, _ in sources:
+            _pool().release(path)
+            conn.execute(f"ATTACH {sql_string(path)} AS {alias} (READ_ONLY)")
+        rows = conn.execute(
+            " UNION ALL ".join(
+                f"SELECT '{alias}' AS source, count(*) AS objects FROM {alias}.{table}"
+                for alias, _, table in sources
+            )
+        ).fetchall()
     finally:
         conn.close()
+    print(
+        "=== All Datasets ===",
+        *(f"  {source}: {objects:,}" for source, objects in rows),
+        f"  total: {sum(n for _, n in rows):,}",
+        sep="\n",
+    )
 
 
 task.default("ingest")
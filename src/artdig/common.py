@@ -1,15 +1,410 @@
 """Shared utilities for artdig ingesters."""
 
+import atexit
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import UTC, datetime
+from email.utils import formatdate
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
+from io import BytesIO
+from itertools import pairwise
 from pathlib import Path
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
 
 import duckdb
 
+USER_AGENT = "artdig/0.1"
+
 
 def now_utc() -> datetime:
     return datetime.now(UTC)
 
 
-def open_db(path: Path) -> duckdb.DuckDBPyConnection:
+def open_db(
+    path: Path,
+    *,
+    read_only: bool = False,
+    threads: int | None = None,
+    memory_limit: str | None = None,
+) -> duckdb.DuckDBPyConnection:
+    """Open a DuckDB database tuned for bulk loads.
+
+    Insertion order is not preserved so large INSERT ... SELECT loads can
+    run in parallel and spill to a temp directory next to the database
+    instead of running out of memory. The WAL is checkpointed every 1 GB
+    rather than every 16 MB, so bulk loads aren't interrupted by frequent
+    checkpoints. memory_limit defaults to DuckDB's own (80% of RAM).
+    read_only opens let several processes query the same file at once.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    return duckdb.connect(str(path))
+    config: dict[str, str | int | bool] = {
+        "threads": threads or os.cpu_count() or 4,
+        "preserve_insertion_order": False,
+        "temp_directory": str(path.parent / ".duckdb_tmp"),
+        "checkpoint_threshold": "1GB",
+    }
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+    return duckdb.connect(str(path), read_only=read_only, config=config)
+
+
+class DuckDBPool:
+    """Keeps one open database per path for the life of the process.
+
+    get() returns a cursor on the shared database instance: a separate
+    connection, safe to use from its own thread and to close, that does
+    not reopen or replay the file. get_read_only() does the same for a
+    read-only instance, for queries that never write. A process can't hold
+    one file open both ways, so acquiring either kind closes the other.
+    Databases are checkpointed and closed once, at exit.
+    """
+
+    def __init__(self):
+        self._dbs: dict[Path, duckdb.DuckDBPyConnection] = {}
+        self._read_only: dict[Path, duckdb.DuckDBPyConnection] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def get(self, path: Path) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            db = self._dbs.get(path)
+            if db is None:
+                if (ro := self._read_only.pop(path, None)) is not None:
+                    ro.close()
+                db = self._dbs[path] = open_db(path)
+        return db.cursor()
+
+    def get_read_only(self, path: Path) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            db = self._read_only.get(path)
+            if db is None:
+                if (rw := self._dbs.pop(path, None)) is not None:
+                    rw.execute("CHECKPOINT")
+                    rw.close()
+                db = self._read_only[path] = open_db(path, read_only=True)
+        return db.cursor()
+
+    def release(self, path: Path):
+        """Checkpoint and close path so another instance can attach it."""
+        with self._lock:
+            db = self._dbs.pop(path, None)
+            ro = self._read_only.pop(path, None)
+        if db is not None:
+            db.execute("CHECKPOINT")
+            db.close()
+        if ro is not None:
+            ro.close()
+
+    def close(self):
+        with self._lock:
+            for db in self._dbs.values():
+                db.execute("CHECKPOINT")
+                db.close()
+            for db in self._read_only.values():
+                db.close()
+            self._dbs.clear()
+            self._read_only.clear()
+
+
+def sql_string(value: Path | str) -> str:
+    """Quote a value, usually a file path, as a SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def read_export(path: Path | str) -> str:
+    """Table function SQL reading a source export: CSV, NDJSON or a Parquet cache.
+
+    CSVs are read with the dialect pinned and every column as VARCHAR, so
+    the sniffer infers nothing beyond the header names; ingesters cast in
+    their SELECT. NDJSON paths (a file or glob) are read with their schema
+    unified across files and malformed lines skipped. Parquet caches from
+    export_to_parquet hold the same columns as the export they came from;
+    a glob of per-file caches is likewise unified by column name.
+    """
+    path = str(path)
+    if path.endswith(".parquet"):
+        return f"read_parquet({sql_string(path)}, union_by_name=true)"
+    if path.endswith(".ndjson"):
+        return (
+            f"read_json({sql_string(path)}, format='newline_delimited', "
+            "ignore_errors=true, union_by_name=true)"
+        )
+    return (
+        f"read_csv({sql_string(path)}, delim=',', quote='\"', escape='\"', header=true, "
+        "all_varchar=true, parallel=true, buffer_size=32000000)"
+    )
+
+
+def export_to_parquet(
+    conn: duckdb.DuckDBPyConnection, source: Path | str, dest: Path
+) -> Path:
+    """Convert a CSV or NDJSON export to a ZSTD Parquet file readable via read_export()."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    conn.execute(
+        f"COPY (SELECT * FROM {read_export(source)}) "
+        f"TO {sql_string(tmp)} (FORMAT PARQUET, COMPRESSION ZSTD)"
+    )
+    tmp.replace(dest)
+    return dest
+
+
+def bulk_insert(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    rows: list[dict[str, Any]],
+    *,
+    replace: bool = False,
+    ignore: bool = False,
+) -> None:
+    """Insert rows (dicts keyed by column name) with a single statement.
+
+    The batch travels to DuckDB as one JSON document unpacked by from_json,
+    which is orders of magnitude cheaper than binding every Python value
+    through executemany. JSON columns take native lists/dicts; datetimes
+    are sent as ISO strings and cast to the column type. replace and ignore
+    select INSERT OR REPLACE / INSERT OR IGNORE.
+    """
+    if not rows:
+        return
+    types = {name: typ for name, typ, *_ in conn.execute(f"DESCRIBE {table}").fetchall()}
+    columns = list(rows[0])
+    structure = json.dumps([{c: types[c] for c in columns}])
+    cols = ", ".join(f'"{c}"' for c in columns)
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE" if ignore else "INSERT"
+    conn.execute(
+        f"""
+        {verb} INTO {table} ({cols})
+        SELECT {cols} FROM (SELECT unnest(from_json(?, ?), recursive := true))
+        """,
+        [json.dumps(rows, default=str), structure],
+    )
+
+
+def _validators(headers) -> dict[str, str | None]:
+    """The cache validators from a response's headers, as kept in .meta.json."""
+    return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+def _ranged_size(url: str) -> tuple[str, int, dict[str, str | None]] | None:
+    """HEAD url; (final url, size, validators) if the server accepts byte ranges."""
+    req = Request(url, method="HEAD", headers={"User-Agent": USER_AGENT})
+    with urlopen(req) as resp:
+        size = resp.headers.get("Content-Length")
+        if resp.headers.get("Accept-Ranges") != "bytes" or not size:
+            return None
+        return resp.url, int(size), _validators(resp.headers)
+
+
+def _download_ranges(
+    url: str, dest: Path, size: int, connections: int, chunk_size: int
+) -> None:
+    """Fetch url into dest (preallocated to size) over parallel Range requests."""
+    with dest.open("wb") as f:
+        f.truncate(size)
+
+    def fetch(start: int, end: int):
+        req = Request(url, headers={"User-Agent": USER_AGENT, "Range": f"bytes={start}-{end}"})
+        with urlopen(req) as resp, dest.open("r+b") as f:
+            if resp.status != 206:
+                raise RuntimeError(f"{url}: server ignored Range request")
+            f.seek(start)
+            shutil.copyfileobj(resp, f, chunk_size)
+
+    bounds = [size * i // connections for i in range(connections + 1)]
+    with ThreadPoolExecutor(max_workers=connections) as ex:
+        futures = [
+            ex.submit(fetch, start, end - 1)
+            for start, end in pairwise(bounds)
+            if end > start
+        ]
+        for fut in futures:
+            fut.result()
+
+
+def download(
+    url: str, dest: Path, *, chunk_size: int = 1 << 20, connections: int = 1
+) -> Path | None:
+    """Stream url to dest, resuming an interrupted transfer from dest.part.
+
+    The response's ETag/Last-Modified are kept in dest.meta.json; when dest
+    is already present the request is made conditional and None is
+    returned if the server answers 304 Not Modified. A dest without a
+    sidecar (fetched before they were kept) is revalidated by its mtime.
+
+    With connections > 1 a fresh download is split into that many byte
+    ranges fetched in parallel (into dest.seg, which is not resumable),
+    if the server supports ranges.
+    """
+    part = dest.with_name(dest.name + ".part")
+    meta = dest.with_name(dest.name + ".meta.json")
+    offset = part.stat().st_size if part.exists() else 0
+    revalidate = dest.exists()
+
+    if connections > 1 and not offset and not revalidate:
+        ranged = _ranged_size(url)
+        if ranged:
+            final_url, size, validators = ranged
+            seg = dest.with_name(dest.name + ".seg")
+            _download_ranges(final_url, seg, size, connections, chunk_size)
+            seg.replace(dest)
+            if any(validators.values()):
+                meta.write_text(json.dumps(validators))
+            return dest
+
+    headers = {"User-Agent": USER_AGENT}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+    elif revalidate and meta.exists():
+        validators = json.loads(meta.read_text())
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    elif revalidate:
+        headers["If-Modified-Since"] = formatdate(dest.stat().st_mtime, usegmt=True)
+    validators = {}
+    try:
+        with urlopen(Request(url, headers=headers)) as resp:
+            validators = _validators(resp.headers)
+            # Servers that ignore Range answer 200 with the full body.
+            mode = "ab" if resp.status == 206 else "wb"
+            with part.open(mode) as f:
+                shutil.copyfileobj(resp, f, chunk_size)
+    except HTTPError as e:
+        if e.code == 304:
+            validators = _validators(e.headers)
+            if not meta.exists() and any(validators.values()):
+                meta.write_text(json.dumps(validators))
+            return None
+        # 416: the partial file already holds the whole body.
+        if e.code != 416 or not offset:
+            raise
+    part.replace(dest)
+    if any(validators.values()):
+        meta.write_text(json.dumps(validators))
+    return dest
+
+
+_keepalive = threading.local()
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+
+
+def _connection(scheme: str, netloc: str, timeout: float) -> HTTPConnection:
+    """This thread's persistent connection to netloc, opened on first use."""
+    conns = _keepalive.__dict__.setdefault("conns", {})
+    conn = conns.get((scheme, netloc))
+    if conn is None:
+        cls = HTTPSConnection if scheme == "https" else HTTPConnection
+        conn = conns[(scheme, netloc)] = cls(netloc, timeout=timeout)
+    elif conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    conn.timeout = timeout
+    return conn
+
+
+def _get(url: str, headers: dict[str, str], timeout: float) -> tuple[HTTPResponse, bytes]:
+    """GET url on the kept-alive connection, reading the whole body.
+
+    A reused connection the server has since closed is reopened once.
+    """
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    while True:
+        conn = _connection(parts.scheme, parts.netloc, timeout)
+        reused = conn.sock is not None
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except ConnectionError as e:
+            conn.close()
+            if reused:
+                continue
+            raise URLError(e) from e
+        except (OSError, HTTPException) as e:
+            conn.close()
+            raise URLError(e) from e
+        if resp.will_close:
+            conn.close()
+        return resp, body
+
+
+def fetch_bytes(req: Request, *, timeout: float, retries: int = 5) -> bytes:
+    """Body of a GET request, sent over a per-thread keep-alive connection.
+
+    Unlike urlopen, repeated requests to one host reuse the TCP/TLS
+    connection. Redirects are followed; 4xx/5xx raise HTTPError, retrying
+    429/503 and honouring Retry-After (seconds); network failures raise
+    URLError.
+    """
+    headers = dict(req.header_items())
+    for attempt in range(retries + 1):
+        url = req.full_url
+        for _ in range(10):
+            resp, body = _get(url, headers, timeout)
+            location = resp.headers.get("Location")
+            if resp.status not in _REDIRECTS or not location:
+                break
+            url = urljoin(url, location)
+        if resp.status < 400:
+            return body
+        if resp.status not in (429, 503) or attempt == retries:
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, BytesIO(body))
+        retry_after = resp.headers.get("Retry-After", "")
+        time.sleep(float(retry_after) if retry_after.isdigit() else 2**attempt)
+    raise AssertionError("unreachable")
+
+
+def map_bounded[T, R](
+    ex: Executor, fn: Callable[[T], R], items: Iterable[T], window: int
+) -> Iterator[R]:
+    """Like ex.map, but keeps at most `window` items in flight and yields in order.
+
+    Items are pulled lazily, so a consumer that stops early leaves at most
+    `window` submitted calls behind.
+    """
+    pending: deque[Future[R]] = deque()
+    for item in items:
+        pending.append(ex.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def fetch_all[R](
+    fetch: Callable[[str], R],
+    urls: Iterable[str],
+    *,
+    concurrency: int,
+    sleep_seconds: float = 0.0,
+) -> Iterator[tuple[str, R | HTTPError | URLError | ValueError]]:
+    """Run fetch(url) on `concurrency` threads, yielding (url, result) in order.
+
+    HTTP and network errors, and ValueErrors from bodies fetch could not
+    parse (e.g. malformed JSON), are yielded in place of the result so
+    callers can record them per URL. Each worker sleeps sleep_seconds
+    before its request to keep the overall rate polite.
+    """
+
+    def run(url: str) -> tuple[str, R | HTTPError | URLError | ValueError]:
+        if sleep_seconds > 0:
+            time.sleep(sleep_seconds)
+        try:
+            return url, fetch(url)
+        except (HTTPError, URLError, ValueError) as e:
+            return url, e
+
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        yield from map_bounded(ex, run, urls, concurrency * 2)
@@ -4,18 +4,23 @@ from __future__ import annotations
 
 import json
 import re
-import time
 from dataclasses import dataclass
+from datetime import datetime
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 import duckdb
 
-from artdig.common import now_utc
+from artdig.common import bulk_insert, fetch_all, fetch_bytes, now_utc
 
 ACTIVITY_ROOT = "https://data.getty.edu/museum/collection/activity-stream"
 OBJECT_PREFIX = "https://data.getty.edu/museum/collection/object/"
 SPARQL_ENDPOINT = "https://data.getty.edu/museum/collection/sparql"
+# Fetched objects are buffered and written in batches of this many.
+FLUSH_EVERY = 1000
+
+_PAGE_NUMBER_RE = re.compile(r"/page/(\d+)$")
+_YEAR_PREFIX_RE = re.compile(r"^(\d{4})")
 
 
 def _fetch_json(url: str, timeout: float = 10.0) -> dict:
@@ -26,9 +31,7 @@ def _fetch_json(url: str, timeout: float = 10.0) -> dict:
             "User-Agent": "artdig-getty-ingester/0.1",
         },
     )
-    with urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    return json.loads(data)
+    return json.loads(fetch_bytes(req, timeout=timeout))
 
 
 def _fetch_sparql_json(query: str, timeout: float = 60.0) -> dict:
@@ -43,15 +46,13 @@ def _fetch_sparql_json(query: str, timeout: float = 60.0) -> dict:
             "User-Agent": "artdig-getty-ingester/0.1",
         },
     )
-    with urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    return json.loads(data)
+    return json.loads(fetch_bytes(req, timeout=timeout))
 
 
 def _parse_page_number(url: str | None) -> int | None:
     if not url:
         return None
-    m = re.search(r"/page/(\d+)$", url)
+    m = _PAGE_NUMBER_RE.search(url)
     if not m:
         return None
     return int(m.group(1))
@@ -60,7 +61,7 @@ def _parse_page_number(url: str | None) -> int | None:
 def _parse_year(value: str | None) -> int | None:
     if not value:
         return None
-    m = re.match(r"^(\d{4})", value)
+    m = _YEAR_PREFIX_RE.match(value)
     if not m:
         return None
     return int(m.group(1))
@@ -74,42 +75,39 @@ def _extract_labels(items: list[dict] | None) -> str | None:
     return " | ".join(labels) if labels else None
 
 
-def _extract_title(identified_by: list[dict] | None, fallback: str | None) -> str | None:
+def _extract_identifiers(
+    identified_by: list[dict] | None, fallback: str | None
+) -> tuple[str | None, str | None]:
+    """(title, accession_number) from one pass over identified_by.
+
+    The title is the first Name classified as a preferred term or primary
+    title, else the first Name, else fallback.
+    """
     if not identified_by:
-        return fallback
+        return fallback, None
 
     preferred = None
     first_name = None
+    accession = None
     for entry in identified_by:
-        if entry.get("type") != "Name":
-            continue
         content = (entry.get("content") or "").strip()
         if not content:
             continue
-        if first_name is None:
+        is_name = entry.get("type") == "Name"
+        if is_name and first_name is None:
             first_name = content
         for cls in entry.get("classified_as", []):
             label = (cls.get("_label") or "").lower()
-            if "preferred term" in label or "primary title" in label:
+            if accession is None and label == "accession number":
+                accession = content
+            if is_name and preferred is None and (
+                "preferred term" in label or "primary title" in label
+            ):
                 preferred = content
-                break
-        if preferred:
+        if preferred and accession:
             break
 
-    return preferred or first_name or fallback
-
-
-def _extract_accession_number(identified_by: list[dict] | None) -> str | None:
-    if not identified_by:
-        return None
-    for entry in identified_by:
-        content = (entry.get("content") or "").strip()
-        if not content:
-            continue
-        for cls in entry.get("classified_as", []):
-            if (cls.get("_label") or "").lower() == "accession number":
-                return content
-    return None
+    return preferred or first_name or fallback, accession
 
 
 def _extract_makers(obj: dict) -> str | None:
@@ -126,20 +124,21 @@ def _extract_display_date(obj: dict) -> str | None:
     return None
 
 
-def _extract_source_url(obj: dict) -> str | None:
+def _extract_subject_urls(obj: dict) -> tuple[str | None, str | None]:
+    """(source_url, iiif_manifest_url) from one pass over subject_of."""
+    source_url = None
+    manifest_url = None
     for item in obj.get("subject_of", []):
         value = item.get("id") if isinstance(item, dict) else None
-        if isinstance(value, str) and "getty.edu/art/collection/object/" in value:
-            return value
-    return None
-
-
-def _extract_iiif_manifest_url(obj: dict) -> str | None:
-    for item in obj.get("subject_of", []):
-        value = item.get("id") if isinstance(item, dict) else None
-        if isinstance(value, str) and "/iiif/manifest/" in value:
-            return value
-    return None
+        if not isinstance(value, str):
+            continue
+        if source_url is None and "getty.edu/art/collection/object/" in value:
+            source_url = value
+        if manifest_url is None and "/iiif/manifest/" in value:
+            manifest_url = value
+        if source_url and manifest_url:
+            break
+    return source_url, manifest_url
 
 
 def _extract_image_url(obj: dict) -> str | None:
@@ -175,6 +174,7 @@ class GettyConfig:
     max_pages: int | None = None
     max_objects: int | None = None
     sleep_seconds: float = 0.02
+    concurrency: int = 8
 
 
 class GettyIngester:
@@ -182,6 +182,8 @@ class GettyIngester:
 
     def __init__(self, conn: duckdb.DuckDBPyConnection):
         self.conn = conn
+        self._objects: list[dict] = []
+        self._index_updates: list[dict] = []
         self._ensure_schema()
 
     def _ensure_schema(self):
@@ -193,9 +195,7 @@ class GettyIngester:
                 event_time           TIMESTAMP,
                 object_url           VARCHAR,
                 raw                  JSON
-            )
-        """)
-        self.conn.execute("""
+            );
             CREATE TABLE IF NOT EXISTS getty_objects (
                 object_url           VARCHAR PRIMARY KEY,
                 object_uuid          VARCHAR,
@@ -215,9 +215,7 @@ class GettyIngester:
                 is_metadata_cc0      BOOLEAN,
                 fetched_at           TIMESTAMP,
                 raw                  JSON
-            )
-        """)
-        self.conn.execute("""
+            );
             CREATE TABLE IF NOT EXISTS getty_object_index (
                 object_url      VARCHAR PRIMARY KEY,
                 status          VARCHAR NOT NULL DEFAULT 'pending',
@@ -227,7 +225,13 @@ class GettyIngester:
             )
         """)
 
-    def _upsert_object(self, obj: dict, object_url_hint: str | None = None) -> str:
+    def _queue_object(
+        self,
+        obj: dict,
+        object_url_hint: str | None = None,
+        fetched_at: datetime | None = None,
+    ) -> str:
+        """Buffer obj as a getty_objects row; _flush() writes the buffer."""
         object_id = obj.get("id") or object_url_hint
         if not isinstance(object_id, str) or not object_id:
             raise ValueError("Object payload does not include a valid 'id'")
@@ -240,53 +244,82 @@ class GettyIngester:
             obj.get("produced_by", {}).get("timespan", {}).get("end_of_the_end")
         )
 
-        self.conn.execute(
-            """
-            INSERT OR REPLACE INTO getty_objects (
-                object_url,
-                object_uuid,
-                object_type,
-                label,
-                title,
-                accession_number,
-                classification,
-                makers,
-                date_display,
-                date_begin,
-                date_end,
-                materials,
-                source_url,
-                iiif_manifest_url,
-                image_url,
-                is_metadata_cc0,
-                fetched_at,
-                raw
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?::JSON)
-            """,
-            [
-                object_id,
-                object_uuid,
-                obj.get("type"),
-                obj.get("_label"),
-                _extract_title(obj.get("identified_by"), obj.get("_label")),
-                _extract_accession_number(obj.get("identified_by")),
-                _extract_labels(obj.get("classified_as")),
-                _extract_makers(obj),
-                _extract_display_date(obj),
-                date_begin,
-                date_end,
-                _extract_labels(obj.get("made_of")),
-                _extract_source_url(obj),
-                _extract_iiif_manifest_url(obj),
-                _extract_image_url(obj),
-                _is_metadata_cc0(obj),
-                now_utc(),
-                json.dumps(obj),
-            ],
+        title, accession_number = _extract_identifiers(
+            obj.get("identified_by"), obj.get("_label")
         )
+        source_url, iiif_manifest_url = _extract_subject_urls(obj)
+        self._objects.append({
+            "object_url": object_id,
+            "object_uuid": object_uuid,
+            "object_type": obj.get("type"),
+            "label": obj.get("_label"),
+            "title": title,
+            "accession_number": accession_number,
+            "classification": _extract_labels(obj.get("classified_as")),
+            "makers": _extract_makers(obj),
+            "date_display": _extract_display_date(obj),
+            "date_begin": date_begin,
+            "date_end": date_end,
+            "materials": _extract_labels(obj.get("made_of")),
+            "source_url": source_url,
+            "iiif_manifest_url": iiif_manifest_url,
+            "image_url": _extract_image_url(obj),
+            "is_metadata_cc0": _is_metadata_cc0(obj),
+            "fetched_at": fetched_at or now_utc(),
+            "raw": obj,
+        })
         return object_id
 
+    def _queue_index_update(
+        self, object_url: str, status: str, error_message: str | None = None
+    ):
+        self._index_updates.append({
+            "object_url": object_url,
+            "status": status,
+            "fetched_at": now_utc() if status == "done" else None,
+            "error_message": error_message,
+        })
+
+    def _flush(self):
+        """Write buffered objects and index updates in one transaction.
+
+        Each table gets one statement; buffers are keyed by URL so a repeat
+        keeps only its last version.
+        """
+        if not (self._objects or self._index_updates):
+            return
+        self.conn.begin()
+        try:
+            if self._objects:
+                rows = {r["object_url"]: r for r in self._objects}
+                bulk_insert(self.conn, "getty_objects", list(rows.values()), replace=True)
+            if self._index_updates:
+                rows = {r["object_url"]: r for r in self._index_updates}
+                self.conn.execute("""
+                    CREATE OR REPLACE TEMP TABLE getty_index_updates (
+                        object_url      VARCHAR,
+                        status          VARCHAR,
+                        fetched_at      TIMESTAMP,
+                        error_message   VARCHAR
+                    )
+                """)
+                bulk_insert(self.conn, "getty_index_updates", list(rows.values()))
+                self.conn.execute("""
+                    UPDATE getty_object_index idx
+                    SET status = u.status,
+                        fetched_at = COALESCE(u.fetched_at, idx.fetched_at),
+                        error_message = u.error_message
+                    FROM getty_index_updates u
+                    WHERE idx.object_url = u.object_url
+                """)
+                self.conn.execute("DROP TABLE getty_index_updates")
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        self._objects.clear()
+        self._index_updates.clear()
+
     def _resolve_to_page(self, requested_to_page: int | None) -> int:
         if requested_to_page is not None:
             return requested_to_page
@@ -298,79 +331,131 @@ class GettyIngester:
         return last_page
 
     def ingest_activity_pages(
-        self, *, from_page: int, to_page: int, max_pages: int | None, sleep_seconds: float
-    ) -> set[str]:
-        object_urls: set[str] = set()
-        pages_done = 0
-
-        for page in range(from_page, to_page + 1):
-            if max_pages is not None and pages_done >= max_pages:
-                break
-
-            page_url = f"{ACTIVITY_ROOT}/page/{page}"
-            payload = _fetch_json(page_url)
+        self,
+        *,
+        from_page: int,
+        to_page: int,
+        max_pages: int | None,
+        sleep_seconds: float,
+        concurrency: int = 8,
+    ) -> int:
+        """Store activity pages from_page..to_page; returns the last page stored."""
+        last_page = to_page if max_pages is None else min(to_page, from_page + max_pages - 1)
+        page_urls = [f"{ACTIVITY_ROOT}/page/{page}" for page in range(from_page, last_page + 1)]
+
+        for page_url, payload in fetch_all(
+            _fetch_json, page_urls, concurrency=concurrency, sleep_seconds=sleep_seconds
+        ):
+            if isinstance(payload, Exception):
+                raise payload
+            page = _parse_page_number(page_url)
             items = payload.get("orderedItems", [])
-            pages_done += 1
 
+            rows: dict[str, dict] = {}
             for item in items:
                 activity_id = item.get("id")
                 if not activity_id:
                     continue
-                object_url = _event_object_url(item)
-                event_time = item.get("endTime")
-
-                self.conn.execute(
-                    """
-                    INSERT OR REPLACE INTO getty_activity
-                    (activity_id, page_number, activity_type, event_time, object_url, raw)
-                    VALUES (?, ?, ?, TRY_CAST(? AS TIMESTAMP), ?, ?::JSON)
-                    """,
-                    [
-                        activity_id,
-                        page,
-                        item.get("type"),
-                        event_time,
-                        object_url,
-                        json.dumps(item),
-                    ],
-                )
-
-                if object_url and object_url.startswith(OBJECT_PREFIX):
-                    object_urls.add(object_url)
+                rows[activity_id] = {
+                    "activity_id": activity_id,
+                    "page_number": page,
+                    "activity_type": item.get("type"),
+                    "event_time": item.get("endTime"),
+                    "object_url": _event_object_url(item),
+                    "raw": item,
+                }
+            bulk_insert(self.conn, "getty_activity", list(rows.values()), replace=True)
 
             print(f"Getty: activity page {page} ingested ({len(items)} events)")
-            if sleep_seconds > 0:
-                time.sleep(sleep_seconds)
 
-        return object_urls
+        return last_page
+
+    def stale_object_urls(self, from_page: int, to_page: int) -> list[str]:
+        """Objects named on activity pages from_page..to_page that need fetching.
+
+        An object is skipped when its stored copy was fetched after its
+        latest event on those pages; missing timestamps count as stale.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT a.object_url
+            FROM getty_activity a
+            LEFT JOIN getty_objects o USING (object_url)
+            WHERE a.page_number BETWEEN ? AND ?
+              AND starts_with(a.object_url, ?)
+            GROUP BY a.object_url
+            HAVING coalesce(max(o.fetched_at) >= max(a.event_time), false) = false
+            ORDER BY a.object_url
+            """,
+            [from_page, to_page, OBJECT_PREFIX],
+        ).fetchall()
+        return [r[0] for r in rows]
 
     def ingest_objects(
-        self, object_urls: list[str], *, max_objects: int | None, sleep_seconds: float
+        self,
+        object_urls: list[str],
+        *,
+        max_objects: int | None,
+        sleep_seconds: float,
+        concurrency: int = 8,
     ):
         processed = 0
-        for object_url in object_urls:
-            if max_objects is not None and processed >= max_objects:
-                break
-
-            try:
-                obj = _fetch_json(object_url)
-            except HTTPError as e:
-                print(f"Getty: skipping {object_url} ({e.code})")
-                continue
-            except URLError as e:
-                print(f"Getty: network error for {object_url} ({e})")
-                continue
+        # Flush on the way out too, so an error keeps the objects already fetched.
+        try:
+            for object_url, obj in fetch_all(
+                _fetch_json, object_urls, concurrency=concurrency, sleep_seconds=sleep_seconds
+            ):
+                if max_objects is not None and processed >= max_objects:
+                    break
+
+                if isinstance(obj, HTTPError):
+                    print(f"Getty: skipping {object_url} ({obj.code})")
+                    continue
+                if isinstance(obj, URLError):
+                    print(f"Getty: network error for {object_url} ({obj})")
+                    continue
+                if isinstance(obj, ValueError):
+                    print(f"Getty: skipping {object_url} (invalid JSON: {obj})")
+                    continue
 
-            self._upsert_object(obj, object_url_hint=object_url)
+                self._queue_object(obj, object_url_hint=object_url)
 
-            processed += 1
-            if processed % 100 == 0:
-                print(f"Getty: fetched {processed:,}/{len(object_urls):,} objects")
-            if sleep_seconds > 0:
-                time.sleep(sleep_seconds)
+                processed += 1
+                if processed % 100 == 0:
+                    print(f"Getty: fetched {processed:,}/{len(object_urls):,} objects")
+                if processed % FLUSH_EVERY == 0:
+                    self._flush()
+        finally:
+            self._flush()
 
         print(f"Getty: object ingest complete ({processed:,} records fetched)")
 
+    def reparse(self):
+        """Re-derive getty_objects columns from the stored raw JSON (no network)."""
+        updated = 0
+        last_url = ""
+        while True:
+            rows = self.conn.execute(
+                """
+                SELECT object_url, fetched_at, raw
+                FROM getty_objects
+                WHERE object_url > ?
+                ORDER BY object_url
+                LIMIT ?
+                """,
+                [last_url, FLUSH_EVERY],
+            ).fetchall()
+            if not rows:
+                break
+            for object_url, fetched_at, raw in rows:
+                self._queue_object(
+                    json.loads(raw), object_url_hint=object_url, fetched_at=fetched_at
+                )
+            self._flush()
+            updated += len(rows)
+            last_url = rows[-1][0]
+        print(f"Getty: reparsed {updated:,} objects")
+
     def build_object_index_from_sparql(self) -> int:
         query = """
 PREFIX crm: <http://www.cidoc-crm.org/cidoc-crm/>
@@ -391,17 +476,11 @@ LIMIT 200000
         urls = [u for u in urls if isinstance(u, str)]
 
         now = now_utc()
-        self.conn.execute("SET preserve_insertion_order = false")
-        chunk_size = 5000
-        for start in range(0, len(urls), chunk_size):
-            chunk = urls[start : start + chunk_size]
-            self.conn.executemany(
-                """
-                INSERT OR IGNORE INTO getty_object_index (object_url, status, indexed_at)
-                VALUES (?, 'pending', ?)
-                """,
-                [(u, now) for u in chunk],
-            )
+        rows = [
+            {"object_url": u, "status": "pending", "indexed_at": now}
+            for u in dict.fromkeys(urls)
+        ]
+        bulk_insert(self.conn, "getty_object_index", rows, ignore=True)
 
         self.conn.execute(
             """
@@ -414,14 +493,21 @@ LIMIT 200000
             """
         )
 
-        total = self.conn.execute("SELECT count(*) FROM getty_object_index").fetchone()[0]
-        pending = self.conn.execute(
-            "SELECT count(*) FROM getty_object_index WHERE status = 'pending'"
-        ).fetchone()[0]
+        total, pending = self.conn.execute(
+            "SELECT count(*), count(*) FILTER (WHERE status = 'pending') FROM getty_object_index"
+        ).fetchone()
         print(f"Getty: SPARQL index loaded ({total:,} total, {pending:,} pending)")
         return total
 
-    def hydrate_pending_objects(self, *, limit: int, sleep_seconds: float) -> tuple[int, int]:
+    def hydrate_pending_objects(
+        self, *, limit: int, sleep_seconds: float, concurrency: int = 8
+    ) -> tuple[int, int]:
+        """Fetch up to `limit` pending objects, `concurrency` requests at a time.
+
+        Fetches run through common.fetch_all (each worker still sleeps
+        sleep_seconds before a request); results are buffered on this
+        thread and written every FLUSH_EVERY objects.
+        """
         rows = self.conn.execute(
             """
             SELECT object_url
@@ -436,44 +522,33 @@ LIMIT 200000
 
         success = 0
         errors = 0
-        for i, object_url in enumerate(urls, start=1):
-            try:
-                obj = _fetch_json(object_url)
-                object_id = self._upsert_object(obj, object_url_hint=object_url)
-                self.conn.execute(
-                    """
-                    UPDATE getty_object_index
-                    SET status = 'done', fetched_at = ?, error_message = NULL
-                    WHERE object_url = ?
-                    """,
-                    [now_utc(), object_id],
-                )
-                success += 1
-            except HTTPError as e:
-                self.conn.execute(
-                    """
-                    UPDATE getty_object_index
-                    SET status = 'error', error_message = ?
-                    WHERE object_url = ?
-                    """,
-                    [f"HTTP {e.code}", object_url],
-                )
-                errors += 1
-            except URLError as e:
-                self.conn.execute(
-                    """
-                    UPDATE getty_object_index
-                    SET status = 'error', error_message = ?
-                    WHERE object_url = ?
-                    """,
-                    [f"URL error: {e}", object_url],
-                )
-                errors += 1
-
-            if i % 100 == 0:
-                print(f"Getty: hydrated {i:,}/{len(urls):,} pending objects")
-            if sleep_seconds > 0:
-                time.sleep(sleep_seconds)
+        results = fetch_all(
+            _fetch_json, urls, concurrency=concurrency, sleep_seconds=sleep_seconds
+        )
+        # Flush on the way out too, so an error keeps the objects already fetched.
+        try:
+            for i, (object_url, result) in enumerate(results, start=1):
+                if isinstance(result, HTTPError):
+                    self._queue_index_update(object_url, "error", f"HTTP {result.code}")
+                    errors += 1
+                elif isinstance(result, URLError):
+                    self._queue_index_update(object_url, "error", f"URL error: {result}")
+                    errors += 1
+                elif isinstance(result, ValueError):
+                    self._queue_index_update(object_url, "error", f"Invalid JSON: {result}")
+                    errors += 1
+                else:
+                    object_id = self._queue_object(result, object_url_hint=object_url)
+                    self._queue_index_update(object_id, "done")
+                    success += 1
+
+                if i % 100 == 0:
+                    print(f"Getty: hydrated {i:,}/{len(urls):,} pending objects")
+                if i % FLUSH_EVERY == 0:
+                    self._flush()
+                    self.conn.execute("CHECKPOINT")
+        finally:
+            self._flush()
 
         print(f"Getty: hydrate pending complete (success={success:,}, errors={errors:,})")
         return success, errors
@@ -483,23 +558,23 @@ LIMIT 200000
         if to_page < cfg.from_page:
             raise ValueError(f"Invalid page range: from_page={cfg.from_page}, to_page={to_page}")
 
-        object_urls = self.ingest_activity_pages(
+        last_page = self.ingest_activity_pages(
             from_page=cfg.from_page,
             to_page=to_page,
             max_pages=cfg.max_pages,
             sleep_seconds=cfg.sleep_seconds,
+            concurrency=cfg.concurrency,
         )
-        sorted_urls = sorted(object_urls)
         self.ingest_objects(
-            sorted_urls,
+            self.stale_object_urls(cfg.from_page, last_page),
             max_objects=cfg.max_objects,
             sleep_seconds=cfg.sleep_seconds,
+            concurrency=cfg.concurrency,
         )
 
-        activity_count = self.conn.execute(
-            "SELECT count(*) FROM getty_activity"
-        ).fetchone()[0]
-        object_count = self.conn.execute("SELECT count(*) FROM getty_objects").fetchone()[0]
+        activity_count, object_count = self.conn.execute(
+            "SELECT (SELECT count(*) FROM getty_activity), (SELECT count(*) FROM getty_objects)"
+        ).fetchone()
         print(f"Getty: dataset ready in DB (activity={activity_count:,}, objects={object_count:,})")
 
 
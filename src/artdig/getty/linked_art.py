@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 # Getty AAT vocabulary URIs used for classification lookups.
@@ -39,6 +40,22 @@ LOCAL_DIMS_SHEET = "https://data.getty.edu/local/thesaurus/dimensions-measured-s
 
 OBJECT_PREFIX = "https://data.getty.edu/museum/collection/object/"
 
+# Identifier classifications and their GettyObject.identifiers keys, in
+# match priority order.
+IDENTIFIER_KEYS = {
+    LOCAL_DOR_ID: "dor_id",
+    LOCAL_TMS_ID: "tms_id",
+    LOCAL_SLUG: "slug",
+}
+
+# Label keywords naming a dimension set, in match priority order.
+DIMENSION_SET_KEYWORDS = (
+    ("Image", "image"),
+    ("Sheet", "sheet"),
+    ("Overall", "overall"),
+    ("Mount", "mount"),
+)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -57,6 +74,21 @@ def _has_class(item: dict, aat_id: str) -> bool:
     return False
 
 
+def _class_ids(item: dict) -> frozenset[str]:
+    """All AAT URIs a node is classified_as, as _has_class would match them.
+
+    Build once for nodes tested against several URIs; each test is then a
+    set lookup instead of another walk over classified_as.
+    """
+    ids = []
+    for cls in item.get("classified_as", ()):
+        ids.append(cls.get("id"))
+        nested = cls.get("classified_as")
+        if nested:
+            ids.extend(inner.get("id") for inner in nested)
+    return frozenset(ids)
+
+
 def _has_technique(item: dict, technique_id: str) -> bool:
     """Check if a node's assigned_by contains the given technique."""
     for assignment in item.get("assigned_by", []):
@@ -66,24 +98,53 @@ def _has_technique(item: dict, technique_id: str) -> bool:
     return False
 
 
-def _find_by_class(items: list[dict], aat_id: str) -> dict | None:
-    """Find the first item classified_as the given AAT URI."""
+def _index_by_class(items: list[dict]) -> dict[str, list[dict]]:
+    """Map each AAT URI to the items classified_as it, in list order.
+
+    Covers the same ids as _has_class (direct and one nested level), so
+    index.get(aat_id, []) equals filtering items by _has_class.
+    """
+    index: dict[str, list[dict]] = {}
     for item in items:
-        if _has_class(item, aat_id):
-            return item
+        for cls in item.get("classified_as", ()):
+            ids = [cls.get("id")]
+            nested = cls.get("classified_as")
+            if nested:
+                ids.extend(inner.get("id") for inner in nested)
+            for cls_id in ids:
+                found = index.get(cls_id)
+                if found is None:
+                    index[cls_id] = [item]
+                elif found[-1] is not item:
+                    found.append(item)
+    return index
+
+
+def _first(index: dict[str, list[dict]], aat_id: str) -> dict | None:
+    """First item in a class index classified_as the given AAT URI."""
+    found = index.get(aat_id)
+    return found[0] if found else None
+
+
+@lru_cache(maxsize=256)
+def _dimension_set(label: str) -> str | None:
+    """Canonical dimension set name for a label, if it has a known keyword.
+
+    Cached: records reuse a handful of set and technique labels.
+    """
+    for keyword, name in DIMENSION_SET_KEYWORDS:
+        if keyword in label:
+            return name
     return None
 
 
-def _find_all_by_class(items: list[dict], aat_id: str) -> list[dict]:
-    """Find all items classified_as the given AAT URI."""
-    return [item for item in items if _has_class(item, aat_id)]
-
-
 def _content(item: dict | None) -> str | None:
     if item is None:
         return None
     val = item.get("content")
-    return val.strip() if isinstance(val, str) and val.strip() else None
+    if not isinstance(val, str):
+        return None
+    return val.strip() or None
 
 
 # ---------------------------------------------------------------------------
@@ -91,7 +152,7 @@ def _content(item: dict | None) -> str | None:
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class Artist:
     name: str | None = None
     role: str | None = None
@@ -100,10 +161,21 @@ class Artist:
     id: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        d: dict[str, Any] = {}
+        if self.name is not None:
+            d["name"] = self.name
+        if self.role is not None:
+            d["role"] = self.role
+        if self.nationality_and_dates is not None:
+            d["nationality_and_dates"] = self.nationality_and_dates
+        if self.description is not None:
+            d["description"] = self.description
+        if self.id is not None:
+            d["id"] = self.id
+        return d
 
 
-@dataclass
+@dataclass(slots=True)
 class Dimensions:
     height: float | None = None
     width: float | None = None
@@ -111,10 +183,19 @@ class Dimensions:
     display: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        d: dict[str, Any] = {}
+        if self.height is not None:
+            d["height"] = self.height
+        if self.width is not None:
+            d["width"] = self.width
+        if self.unit is not None:
+            d["unit"] = self.unit
+        if self.display is not None:
+            d["display"] = self.display
+        return d
 
 
-@dataclass
+@dataclass(slots=True)
 class GettyObject:
     """Human-friendly representation of a Getty Linked Art object."""
 
@@ -147,15 +228,57 @@ class GettyObject:
 
     def to_dict(self) -> dict[str, Any]:
         d: dict[str, Any] = {}
-        for k, v in self.__dict__.items():
-            if v is None or v == [] or v == {}:
-                continue
-            if k == "dimensions":
-                d[k] = {name: dim.to_dict() for name, dim in v.items()}
-            elif k == "artists":
-                d[k] = [a.to_dict() for a in v]
-            else:
-                d[k] = v
+        if self.id is not None:
+            d["id"] = self.id
+        if self.title is not None:
+            d["title"] = self.title
+        if self.accession_number is not None:
+            d["accession_number"] = self.accession_number
+        if self.classifications:
+            d["classifications"] = self.classifications
+        if self.object_type is not None:
+            d["object_type"] = self.object_type
+        if self.medium is not None:
+            d["medium"] = self.medium
+        if self.date is not None:
+            d["date"] = self.date
+        if self.date_begin is not None:
+            d["date_begin"] = self.date_begin
+        if self.date_end is not None:
+            d["date_end"] = self.date_end
+        if self.culture is not None:
+            d["culture"] = self.culture
+        if self.place_created is not None:
+            d["place_created"] = self.place_created
+        if self.description is not None:
+            d["description"] = self.description
+        if self.dimensions:
+            d["dimensions"] = {name: dim.to_dict() for name, dim in self.dimensions.items()}
+        if self.artists:
+            d["artists"] = [a.to_dict() for a in self.artists]
+        if self.copyright is not None:
+            d["copyright"] = self.copyright
+        if self.rights is not None:
+            d["rights"] = self.rights
+        if self.credit_line is not None:
+            d["credit_line"] = self.credit_line
+        if self.department is not None:
+            d["department"] = self.department
+        if self.current_location is not None:
+            d["current_location"] = self.current_location
+        if self.inscriptions:
+            d["inscriptions"] = self.inscriptions
+        if self.signatures:
+            d["signatures"] = self.signatures
+        if self.homepage is not None:
+            d["homepage"] = self.homepage
+        if self.image_url is not None:
+            d["image_url"] = self.image_url
+        if self.iiif_manifest is not None:
+            d["iiif_manifest"] = self.iiif_manifest
+        d["is_public_domain"] = self.is_public_domain
+        if self.identifiers:
+            d["identifiers"] = self.identifiers
         return d
 
 
@@ -177,12 +300,13 @@ def convert(raw: dict) -> GettyObject:
 
     identified_by = raw.get("identified_by", [])
     referred_to_by = raw.get("referred_to_by", [])
+    refs = _index_by_class(referred_to_by)
 
     # Title: prefer Name with Preferred Term classification
     obj.title = _extract_title(identified_by, raw.get("_label"))
 
     # Accession number
-    acc = _find_by_class(identified_by, AAT_ACCESSION_NUMBER)
+    acc = _first(_index_by_class(identified_by), AAT_ACCESSION_NUMBER)
     obj.accession_number = _content(acc)
 
     # Classifications (types with classification category)
@@ -195,15 +319,15 @@ def convert(raw: dict) -> GettyObject:
     # Object type, medium, culture, place created, description, copyright,
     # credit line, dimensions statement, inscriptions, signatures
     # — all live in referred_to_by
-    obj.object_type = _content(_find_by_class(referred_to_by, AAT_OBJECT_TYPE))
-    obj.medium = _content(_find_by_class(referred_to_by, AAT_MATERIALS))
-    obj.culture = _content(_find_by_class(referred_to_by, AAT_CULTURE))
-    obj.place_created = _content(_find_by_class(referred_to_by, AAT_PLACE_CREATED))
-    obj.copyright = _content(_find_by_class(referred_to_by, AAT_COPYRIGHT))
-    obj.credit_line = _content(_find_by_class(referred_to_by, AAT_CREDIT_LINE))
+    obj.object_type = _content(_first(refs, AAT_OBJECT_TYPE))
+    obj.medium = _content(_first(refs, AAT_MATERIALS))
+    obj.culture = _content(_first(refs, AAT_CULTURE))
+    obj.place_created = _content(_first(refs, AAT_PLACE_CREATED))
+    obj.copyright = _content(_first(refs, AAT_COPYRIGHT))
+    obj.credit_line = _content(_first(refs, AAT_CREDIT_LINE))
 
     # Description: prefer markdown format
-    for desc in _find_all_by_class(referred_to_by, AAT_DESCRIPTION):
+    for desc in refs.get(AAT_DESCRIPTION, []):
         fmt = desc.get("format", "")
         content = _content(desc)
         if content and fmt == "text/markdown":
@@ -213,16 +337,16 @@ def convert(raw: dict) -> GettyObject:
             obj.description = content
 
     # Inscriptions and signatures (live in "carries", not "referred_to_by")
-    carries = raw.get("carries", [])
+    carries = _index_by_class(raw.get("carries", []))
     obj.inscriptions = [
-        _content(i) for i in _find_all_by_class(carries, AAT_INSCRIPTION) if _content(i)
+        c for i in carries.get(AAT_INSCRIPTION, []) if (c := _content(i))
     ]
     obj.signatures = [
-        _content(i) for i in _find_all_by_class(carries, AAT_SIGNATURE) if _content(i)
+        c for i in carries.get(AAT_SIGNATURE, []) if (c := _content(i))
     ]
 
     # Dimensions (structured from dimension array)
-    _extract_dimensions(raw.get("dimension", []), referred_to_by, obj)
+    _extract_dimensions(raw.get("dimension", []), refs, obj)
 
     # Production / artist info
     produced_by = raw.get("produced_by", {})
@@ -254,13 +378,17 @@ def convert(raw: dict) -> GettyObject:
                 obj.current_location = content
                 break
 
-    # URLs
-    for item in raw.get("subject_of", []):
+    # URLs: the last matching entry wins, so scan from the end and stop
+    # once both are found
+    for item in reversed(raw.get("subject_of", [])):
         item_id = item.get("id", "")
         if "getty.edu/art/collection/object/" in item_id:
-            obj.homepage = item_id
-        elif _has_class(item, LOCAL_IIIF_MANIFEST):
+            if obj.homepage is None:
+                obj.homepage = item_id
+        elif obj.iiif_manifest is None and _has_class(item, LOCAL_IIIF_MANIFEST):
             obj.iiif_manifest = item_id
+        if obj.homepage is not None and obj.iiif_manifest is not None:
+            break
 
     # Image URL
     rep = raw.get("representation", [])
@@ -269,16 +397,16 @@ def convert(raw: dict) -> GettyObject:
 
     # Rights / public domain
     for right in raw.get("subject_to", []):
-        if _has_class(right, AAT_CC0):
+        if not obj.is_public_domain and _has_class(right, AAT_CC0):
             obj.is_public_domain = True
         for cls in right.get("classified_as", []):
             if cls.get("id") == LOCAL_RIGHTS_STATEMENT:
-                desc = right.get("referred_to_by", [])
-                for d in desc:
+                for d in right.get("referred_to_by", []):
                     content = _content(d)
                     if content:
                         obj.rights = content
                         break
+                break
 
     # Identifiers
     _extract_identifiers(identified_by, obj)
@@ -298,14 +426,15 @@ def _extract_title(identified_by: list[dict], fallback: str | None) -> str | Non
             continue
         if first_name is None:
             first_name = content
-        if _has_class(entry, AAT_PREFERRED_TERM) or _has_class(entry, AAT_PRIMARY_TITLE):
+        ids = _class_ids(entry)
+        if AAT_PREFERRED_TERM in ids or AAT_PRIMARY_TITLE in ids:
             preferred = content
             break
     return preferred or first_name or fallback
 
 
 def _extract_dimensions(
-    dimension_items: list[dict], referred_to_by: list[dict], obj: GettyObject
+    dimension_items: list[dict], refs: dict[str, list[dict]], obj: GettyObject
 ) -> None:
     """Extract structured dimensions from dimension array and display strings."""
     # Group measurements by their dimension set
@@ -313,19 +442,15 @@ def _extract_dimensions(
 
     for dim in dimension_items:
         # Skip sort numbers and sequence attributes
-        if _has_class(dim, AAT_HEIGHT) or _has_class(dim, AAT_WIDTH):
+        ids = _class_ids(dim)
+        if AAT_HEIGHT in ids or AAT_WIDTH in ids:
             # Determine which measurement set this belongs to
             set_name = "default"
             for member in dim.get("member_of", []):
                 label = member.get("_label", "")
-                if "Image" in label:
-                    set_name = "image"
-                elif "Sheet" in label:
-                    set_name = "sheet"
-                elif "Overall" in label:
-                    set_name = "overall"
-                elif "Mount" in label:
-                    set_name = "mount"
+                known = _dimension_set(label)
+                if known:
+                    set_name = known
                 else:
                     # Try to extract a name from the label
                     parts = label.replace("Dimensions Set:", "").strip()
@@ -341,14 +466,14 @@ def _extract_dimensions(
             elif unit_label:
                 sets[set_name]["unit"] = unit_label
 
-            if _has_class(dim, AAT_HEIGHT):
+            if AAT_HEIGHT in ids:
                 sets[set_name]["height"] = dim.get("value")
-            elif _has_class(dim, AAT_WIDTH):
+            elif AAT_WIDTH in ids:
                 sets[set_name]["width"] = dim.get("value")
 
     # Also grab display strings from referred_to_by
     display_strings: dict[str, str] = {}
-    for ref in _find_all_by_class(referred_to_by, AAT_DIMENSIONS_DESC):
+    for ref in refs.get(AAT_DIMENSIONS_DESC, []):
         content = _content(ref)
         if not content:
             continue
@@ -356,20 +481,13 @@ def _extract_dimensions(
         set_name = "default"
         for assignment in ref.get("assigned_by", []):
             for tech in assignment.get("technique", []):
-                label = tech.get("_label", "")
-                if "Image" in label:
-                    set_name = "image"
-                elif "Sheet" in label:
-                    set_name = "sheet"
-                elif "Overall" in label:
-                    set_name = "overall"
-                elif "Mount" in label:
-                    set_name = "mount"
+                known = _dimension_set(tech.get("_label", ""))
+                if known:
+                    set_name = known
         display_strings[set_name] = content
 
     # Build Dimensions objects
-    all_set_names = set(sets.keys()) | set(display_strings.keys())
-    for name in sorted(all_set_names):
+    for name in sorted(sets.keys() | display_strings.keys()):
         vals = sets.get(name, {})
         dims = Dimensions(
             height=vals.get("height"),
@@ -382,7 +500,7 @@ def _extract_dimensions(
 
 def _extract_artists(produced_by: dict, obj: GettyObject) -> None:
     """Extract artist info from produced_by."""
-    referred = produced_by.get("referred_to_by", [])
+    referred = _index_by_class(produced_by.get("referred_to_by", []))
     carried_out_by = produced_by.get("carried_out_by", [])
 
     # Build a lookup of role statements per person
@@ -401,9 +519,9 @@ def _extract_artists(produced_by: dict, obj: GettyObject) -> None:
         obj.artists.append(artist)
 
     # Producer description and nationality from production-level referred_to_by
-    name_from_ref = _content(_find_by_class(referred, LOCAL_PRODUCER_NAME))
-    desc_from_ref = _content(_find_by_class(referred, LOCAL_PRODUCER_DESC))
-    nat_from_ref = _content(_find_by_class(referred, LOCAL_PRODUCER_NAT_DATES))
+    name_from_ref = _content(_first(referred, LOCAL_PRODUCER_NAME))
+    desc_from_ref = _content(_first(referred, LOCAL_PRODUCER_DESC))
+    nat_from_ref = _content(_first(referred, LOCAL_PRODUCER_NAT_DATES))
 
     # Attach to matching artist, or create one if none exist
     if obj.artists:
@@ -423,17 +541,15 @@ def _extract_artists(produced_by: dict, obj: GettyObject) -> None:
 
 def _extract_identifiers(identified_by: list[dict], obj: GettyObject) -> None:
     """Extract known identifiers (DOR ID, TMS ID, slug)."""
-    mapping = {
-        LOCAL_DOR_ID: "dor_id",
-        LOCAL_TMS_ID: "tms_id",
-        LOCAL_SLUG: "slug",
-    }
     for entry in identified_by:
         content = _content(entry)
         if not content:
             continue
-        for aat_id, key in mapping.items():
-            if _has_class(entry, aat_id):
+        ids = _class_ids(entry)
+        if ids.isdisjoint(IDENTIFIER_KEYS):
+            continue
+        for aat_id, key in IDENTIFIER_KEYS.items():
+            if aat_id in ids:
                 # Clean up slug prefix
                 if key == "slug" and content.startswith("urn:getty-local:idm:object:slug/"):
                     content = content.split("/")[-1]
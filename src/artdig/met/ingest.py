@@ -4,9 +4,46 @@ from pathlib import Path
 
 import duckdb
 
+from artdig.common import read_export
+
 MET_CSV = Path("data/met/MetObjects.csv")
 
-SCHEMA_DDL = """
+EXTRA_TYPE = """STRUCT(
+        object_number           VARCHAR,
+        is_highlight            BOOLEAN,
+        is_timeline_work        BOOLEAN,
+        gallery_number          VARCHAR,
+        accession_year          VARCHAR,
+        dynasty                 VARCHAR,
+        reign                   VARCHAR,
+        portfolio               VARCHAR,
+        constituent_id          VARCHAR,
+        artist_role             VARCHAR,
+        artist_prefix           VARCHAR,
+        artist_display_bio      VARCHAR,
+        artist_suffix           VARCHAR,
+        artist_alpha_sort       VARCHAR,
+        artist_gender           VARCHAR,
+        artist_ulan_url         VARCHAR,
+        artist_wikidata_url     VARCHAR,
+        geography_type          VARCHAR,
+        region                  VARCHAR,
+        state                   VARCHAR,
+        county                  VARCHAR,
+        subregion               VARCHAR,
+        locale                  VARCHAR,
+        locus                   VARCHAR,
+        excavation              VARCHAR,
+        river                   VARCHAR,
+        credit_line             VARCHAR,
+        rights_and_reproduction VARCHAR,
+        repository              VARCHAR,
+        tags                    VARCHAR,
+        tags_aat_url            VARCHAR,
+        tags_wikidata_url       VARCHAR
+    )"""
+
+SCHEMA_DDL = f"""
 CREATE TABLE IF NOT EXISTS met_objects (
     object_id           INTEGER PRIMARY KEY,
     title               VARCHAR,
@@ -30,7 +67,7 @@ CREATE TABLE IF NOT EXISTS met_objects (
     artist_begin_date   VARCHAR,
     artist_end_date     VARCHAR,
     wikidata_id         VARCHAR,
-    extra               JSON
+    extra               {EXTRA_TYPE}
 );
 """
 
@@ -38,82 +75,97 @@ CREATE TABLE IF NOT EXISTS met_objects (
 class MetIngester:
     """Ingests Met Museum open-access CSV into met_objects table."""
 
-    def __init__(self, conn: duckdb.DuckDBPyConnection, csv_path: Path = MET_CSV):
+    def __init__(self, conn: duckdb.DuckDBPyConnection, source: Path = MET_CSV):
+        """source is MetObjects.csv or its Parquet cache."""
         self.conn = conn
-        self.csv_path = csv_path
+        self.source = source
         self._ensure_schema()
 
     def _ensure_schema(self):
+        # Older tables (e.g. with a JSON extra) need no migration: run()
+        # recreates the table from SCHEMA_DDL.
         self.conn.execute(SCHEMA_DDL)
 
     def run(self):
-        csv = str(self.csv_path)
-        self.conn.execute(f"""
-            INSERT OR REPLACE INTO met_objects
-            SELECT
-                TRY_CAST("Object ID" AS INTEGER)            AS object_id,
-                NULLIF("Title", '')                          AS title,
-                NULLIF("Object Name", '')                    AS object_type,
-                NULLIF("Artist Display Name", '')            AS artist_name,
-                NULLIF("Object Date", '')                    AS date_display,
-                TRY_CAST("Object Begin Date" AS INTEGER)     AS date_start,
-                TRY_CAST("Object End Date" AS INTEGER)       AS date_end,
-                NULLIF("Medium", '')                         AS medium,
-                NULLIF("Dimensions", '')                     AS dimensions,
-                NULLIF("Classification", '')                 AS classification,
-                'https://collectionapi.metmuseum.org/public/collection/v1/objects/' || "Object ID"
-                                                             AS image_url,
-                NULLIF("Link Resource", '')                  AS source_url,
-                CASE WHEN "Is Public Domain" = 'True'
-                     THEN true ELSE false END                AS is_public_domain,
-                NULLIF("Department", '')                     AS department,
-                NULLIF("Culture", '')                        AS culture,
-                NULLIF("Period", '')                         AS period,
-                NULLIF("Country", '')                        AS country,
-                NULLIF("City", '')                           AS city,
-                NULLIF("Artist Nationality", '')             AS artist_nationality,
-                NULLIF("Artist Begin Date", '')              AS artist_begin_date,
-                NULLIF("Artist End Date", '')                AS artist_end_date,
-                CASE WHEN "Object Wikidata URL" IS NOT NULL AND "Object Wikidata URL" != ''
-                     THEN regexp_extract("Object Wikidata URL", '(Q\\d+)')
-                     ELSE NULL END                           AS wikidata_id,
-                to_json({{
-                    object_number:          NULLIF("Object Number", ''),
-                    is_highlight:           "Is Highlight" = 'True',
-                    is_timeline_work:       "Is Timeline Work" = 'True',
-                    gallery_number:         NULLIF("Gallery Number", ''),
-                    accession_year:         NULLIF("AccessionYear", ''),
-                    dynasty:                NULLIF("Dynasty", ''),
-                    reign:                  NULLIF("Reign", ''),
-                    portfolio:              NULLIF("Portfolio", ''),
-                    constituent_id:         NULLIF("Constituent ID", ''),
-                    artist_role:            NULLIF("Artist Role", ''),
-                    artist_prefix:          NULLIF(TRIM("Artist Prefix"), ''),
-                    artist_display_bio:     NULLIF("Artist Display Bio", ''),
-                    artist_suffix:          NULLIF(TRIM("Artist Suffix"), ''),
-                    artist_alpha_sort:      NULLIF("Artist Alpha Sort", ''),
-                    artist_gender:          NULLIF("Artist Gender", ''),
-                    artist_ulan_url:        NULLIF("Artist ULAN URL", ''),
-                    artist_wikidata_url:    NULLIF("Artist Wikidata URL", ''),
-                    geography_type:         NULLIF("Geography Type", ''),
-                    region:                 NULLIF("Region", ''),
-                    state:                  NULLIF("State", ''),
-                    county:                 NULLIF("County", ''),
-                    subregion:              NULLIF("Subregion", ''),
-                    locale:                 NULLIF("Locale", ''),
-                    locus:                  NULLIF("Locus", ''),
-                    excavation:             NULLIF("Excavation", ''),
-                    river:                  NULLIF("River", ''),
-                    credit_line:            NULLIF("Credit Line", ''),
-                    rights_and_reproduction: NULLIF("Rights and Reproduction", ''),
-                    repository:             NULLIF("Repository", ''),
-                    tags:                   NULLIF("Tags", ''),
-                    tags_aat_url:           NULLIF("Tags AAT URL", ''),
-                    tags_wikidata_url:      NULLIF("Tags Wikidata URL", '')
-                }})                                          AS extra
-            FROM read_csv_auto('{csv}', all_varchar=true)
-            WHERE "Object ID" IS NOT NULL AND "Object ID" != ''
-        """)
+        # Full reload in one transaction: recreate the table, then a plain
+        # bulk INSERT. Dropping the table rather than DELETE-ing every row
+        # spares the primary-key index from retiring each old key while the
+        # new rows go in.
+        self.conn.begin()
+        try:
+            self.conn.execute("DROP TABLE met_objects")
+            self.conn.execute(SCHEMA_DDL)
+            self.conn.execute(f"""
+                INSERT INTO met_objects
+                SELECT
+                    TRY_CAST("Object ID" AS INTEGER)            AS object_id,
+                    NULLIF("Title", '')                          AS title,
+                    NULLIF("Object Name", '')                    AS object_type,
+                    NULLIF("Artist Display Name", '')            AS artist_name,
+                    NULLIF("Object Date", '')                    AS date_display,
+                    TRY_CAST("Object Begin Date" AS INTEGER)     AS date_start,
+                    TRY_CAST("Object End Date" AS INTEGER)       AS date_end,
+                    NULLIF("Medium", '')                         AS medium,
+                    NULLIF("Dimensions", '')                     AS dimensions,
+                    NULLIF("Classification", '')                 AS classification,
+                    'https://collectionapi.metmuseum.org/public/collection/v1/objects/' || "Object ID"
+                                                                 AS image_url,
+                    NULLIF("Link Resource", '')                  AS source_url,
+                    CASE WHEN "Is Public Domain" = 'True'
+                         THEN true ELSE false END                AS is_public_domain,
+                    NULLIF("Department", '')                     AS department,
+                    NULLIF("Culture", '')                        AS culture,
+                    NULLIF("Period", '')                         AS period,
+                    NULLIF("Country", '')                        AS country,
+                    NULLIF("City", '')                           AS city,
+                    NULLIF("Artist Nationality", '')             AS artist_nationality,
+                    NULLIF("Artist Begin Date", '')              AS artist_begin_date,
+                    NULLIF("Artist End Date", '')                AS artist_end_date,
+                    CASE WHEN "Object Wikidata URL" IS NOT NULL AND "Object Wikidata URL" != ''
+                         THEN regexp_extract("Object Wikidata URL", '(Q\\d+)')
+                         ELSE NULL END                           AS wikidata_id,
+                    {{
+                        object_number:          NULLIF("Object Number", ''),
+                        is_highlight:           "Is Highlight" = 'True',
+                        is_timeline_work:       "Is Timeline Work" = 'True',
+                        gallery_number:         NULLIF("Gallery Number", ''),
+                        accession_year:         NULLIF("AccessionYear", ''),
+                        dynasty:                NULLIF("Dynasty", ''),
+                        reign:                  NULLIF("Reign", ''),
+                        portfolio:              NULLIF("Portfolio", ''),
+                        constituent_id:         NULLIF("Constituent ID", ''),
+                        artist_role:            NULLIF("Artist Role", ''),
+                        artist_prefix:          NULLIF(TRIM("Artist Prefix"), ''),
+                        artist_display_bio:     NULLIF("Artist Display Bio", ''),
+                        artist_suffix:          NULLIF(TRIM("Artist Suffix"), ''),
+                        artist_alpha_sort:      NULLIF("Artist Alpha Sort", ''),
+                        artist_gender:          NULLIF("Artist Gender", ''),
+                        artist_ulan_url:        NULLIF("Artist ULAN URL", ''),
+                        artist_wikidata_url:    NULLIF("Artist Wikidata URL", ''),
+                        geography_type:         NULLIF("Geography Type", ''),
+                        region:                 NULLIF("Region", ''),
+                        state:                  NULLIF("State", ''),
+                        county:                 NULLIF("County", ''),
+                        subregion:              NULLIF("Subregion", ''),
+                        locale:                 NULLIF("Locale", ''),
+                        locus:                  NULLIF("Locus", ''),
+                        excavation:             NULLIF("Excavation", ''),
+                        river:                  NULLIF("River", ''),
+                        credit_line:            NULLIF("Credit Line", ''),
+                        rights_and_reproduction: NULLIF("Rights and Reproduction", ''),
+                        repository:             NULLIF("Repository", ''),
+                        tags:                   NULLIF("Tags", ''),
+                        tags_aat_url:           NULLIF("Tags AAT URL", ''),
+                        tags_wikidata_url:      NULLIF("Tags Wikidata URL", '')
+                    }}                                           AS extra
+                FROM {read_export(self.source)}
+                WHERE "Object ID" IS NOT NULL AND "Object ID" != ''
+                ORDER BY object_id
+            """)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
         count = self.conn.execute(
             "SELECT count(*) FROM met_objects"
         ).fetchone()[0]
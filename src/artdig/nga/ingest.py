@@ -4,9 +4,26 @@ from pathlib import Path
 
 import duckdb
 
+from artdig.common import read_export
+
 NGA_DATA = Path("data/nga/data")
 
-SCHEMA_DDL = """
+EXTRA_TYPE = """STRUCT(
+        accession_num                 VARCHAR,
+        sub_classification            VARCHAR,
+        visual_browser_classification VARCHAR,
+        visual_browser_timespan       VARCHAR,
+        parent_id                     VARCHAR,
+        is_virtual                    BOOLEAN,
+        portfolio                     VARCHAR,
+        series                        VARCHAR,
+        volume                        VARCHAR,
+        inscription                   VARCHAR,
+        markings                      VARCHAR,
+        attribution_inverted          VARCHAR
+    )"""
+
+SCHEMA_DDL = f"""
 CREATE TABLE IF NOT EXISTS nga_objects (
     objectid            VARCHAR PRIMARY KEY,
     title               VARCHAR,
@@ -30,125 +47,137 @@ CREATE TABLE IF NOT EXISTS nga_objects (
     thumbnail_url       VARCHAR,
     credit_line         VARCHAR,
     wikidata_id         VARCHAR,
-    extra               JSON
+    extra               {EXTRA_TYPE}
 );
 """
 
 
 class NgaIngester:
-    """Ingests NGA open-data CSVs into nga_objects table."""
+    """Ingests NGA open-data CSVs into nga_objects table.
+
+    suffix=".parquet" reads the Parquet cache of the same files instead.
+    """
 
-    def __init__(self, conn: duckdb.DuckDBPyConnection, data_dir: Path = NGA_DATA):
+    def __init__(
+        self, conn: duckdb.DuckDBPyConnection, data_dir: Path = NGA_DATA, suffix: str = ".csv"
+    ):
         self.conn = conn
-        self.objects = str(data_dir / "objects.csv")
-        self.constituents = str(data_dir / "constituents.csv")
-        self.obj_constituents = str(data_dir / "objects_constituents.csv")
-        self.published_images = str(data_dir / "published_images.csv")
-        self.objects_terms = str(data_dir / "objects_terms.csv")
+        self.objects = data_dir / f"objects{suffix}"
+        self.constituents = data_dir / f"constituents{suffix}"
+        self.obj_constituents = data_dir / f"objects_constituents{suffix}"
+        self.published_images = data_dir / f"published_images{suffix}"
+        self.objects_terms = data_dir / f"objects_terms{suffix}"
         self._ensure_schema()
 
     def _ensure_schema(self):
+        # Older tables (e.g. with a JSON extra) need no migration: run()
+        # recreates the table from SCHEMA_DDL.
         self.conn.execute(SCHEMA_DDL)
 
     def run(self):
-        self.conn.execute(f"""
-            INSERT OR REPLACE INTO nga_objects
-            WITH
-            primary_artist AS (
-                SELECT
-                    oc.objectid,
-                    c.preferreddisplayname AS artist_name,
-                    c.nationality,
-                    TRY_CAST(c.beginyear AS INTEGER) AS birth_year,
-                    TRY_CAST(c.endyear AS INTEGER) AS death_year,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY oc.objectid
-                        ORDER BY oc.displayorder
-                    ) AS rn
-                FROM read_csv_auto('{self.obj_constituents}', all_varchar=true) oc
-                JOIN read_csv_auto('{self.constituents}', all_varchar=true) c
-                    ON oc.constituentid = c.constituentid
-                WHERE oc.roletype = 'artist'
-            ),
-            primary_image AS (
-                SELECT
-                    depictstmsobjectid AS objectid,
-                    iiifurl,
-                    iiifthumburl,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY depictstmsobjectid
-                        ORDER BY sequence
-                    ) AS rn
-                FROM read_csv_auto('{self.published_images}', all_varchar=true)
-                WHERE viewtype = 'primary'
-            ),
-            school_terms AS (
-                SELECT
-                    objectid,
-                    FIRST(term ORDER BY term) AS culture
-                FROM read_csv_auto('{self.objects_terms}', all_varchar=true)
-                WHERE termtype = 'School'
-                GROUP BY objectid
-            ),
-            style_terms AS (
+        # Full reload in one transaction: recreate the table, then a plain
+        # bulk INSERT. Dropping the table rather than DELETE-ing every row
+        # spares the primary-key index from retiring each old key while the
+        # new rows go in.
+        self.conn.begin()
+        try:
+            self.conn.execute("DROP TABLE nga_objects")
+            self.conn.execute(SCHEMA_DDL)
+            self.conn.execute(f"""
+                INSERT INTO nga_objects
+                WITH
+                primary_artist AS (
+                    SELECT
+                        oc.objectid,
+                        c.preferreddisplayname AS artist_name,
+                        c.nationality,
+                        TRY_CAST(c.beginyear AS INTEGER) AS birth_year,
+                        TRY_CAST(c.endyear AS INTEGER) AS death_year,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY oc.objectid
+                            ORDER BY oc.displayorder
+                        ) AS rn
+                    FROM {read_export(self.obj_constituents)} oc
+                    JOIN {read_export(self.constituents)} c
+                        ON oc.constituentid = c.constituentid
+                    WHERE oc.roletype = 'artist'
+                ),
+                primary_image AS (
+                    SELECT
+                        depictstmsobjectid AS objectid,
+                        iiifurl,
+                        iiifthumburl,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY depictstmsobjectid
+                            ORDER BY sequence
+                        ) AS rn
+                    FROM {read_export(self.published_images)}
+                    WHERE viewtype = 'primary'
+                ),
+                terms AS (
+                    -- One pass over objects_terms for both School and Style
+                    SELECT
+                        objectid,
+                        FIRST(term ORDER BY term) FILTER (WHERE termtype = 'School') AS culture,
+                        FIRST(term ORDER BY term) FILTER (WHERE termtype = 'Style') AS period
+                    FROM {read_export(self.objects_terms)}
+                    WHERE termtype IN ('School', 'Style')
+                    GROUP BY objectid
+                )
                 SELECT
-                    objectid,
-                    FIRST(term ORDER BY term) AS period
-                FROM read_csv_auto('{self.objects_terms}', all_varchar=true)
-                WHERE termtype = 'Style'
-                GROUP BY objectid
-            )
-            SELECT
-                o.objectid                                      AS objectid,
-                o.title                                         AS title,
-                NULLIF(o.classification, '')                     AS object_type,
-                pa.artist_name                                  AS artist_name,
-                NULLIF(o.displaydate, '')                        AS date_display,
-                TRY_CAST(o.beginyear AS INTEGER)                 AS date_start,
-                TRY_CAST(o.endyear AS INTEGER)                   AS date_end,
-                NULLIF(o.medium, '')                              AS medium,
-                NULLIF(o.dimensions, '')                          AS dimensions,
-                NULLIF(o.classification, '')                      AS classification,
-                CASE WHEN pi.iiifurl IS NOT NULL
-                     THEN pi.iiifurl || '/full/max/0/default.jpg'
-                     ELSE NULL END                               AS image_url,
-                'https://www.nga.gov/collection/art-object-page.' || o.objectid || '.html'
-                                                                 AS source_url,
-                o.accessioned = '1'                              AS is_public_domain,
-                NULLIF(o.departmentabbr, '')                      AS department,
-                sc.culture                                       AS culture,
-                st.period                                        AS period,
-                pa.nationality                                   AS artist_nationality,
-                pa.birth_year                                    AS artist_birth_year,
-                pa.death_year                                    AS artist_death_year,
-                pi.iiifthumburl                                  AS thumbnail_url,
-                NULLIF(o.creditline, '')                          AS credit_line,
-                NULLIF(o.wikidataid, '')                          AS wikidata_id,
-                to_json({{
-                    accession_num:                  NULLIF(o.accessionnum, ''),
-                    sub_classification:             NULLIF(o.subclassification, ''),
-                    visual_browser_classification:  NULLIF(o.visualbrowserclassification, ''),
-                    visual_browser_timespan:        NULLIF(o.visualbrowsertimespan, ''),
-                    parent_id:                      NULLIF(o.parentid, ''),
-                    is_virtual:                     o.isvirtual = '1',
-                    portfolio:                      NULLIF(o.portfolio, ''),
-                    series:                         NULLIF(o.series, ''),
-                    volume:                         NULLIF(o.volume, ''),
-                    inscription:                    NULLIF(o.inscription, ''),
-                    markings:                       NULLIF(o.markings, ''),
-                    attribution_inverted:           NULLIF(o.attributioninverted, '')
-                }})                                              AS extra
-            FROM read_csv_auto('{self.objects}', all_varchar=true) o
-            LEFT JOIN primary_artist pa
-                ON o.objectid = pa.objectid AND pa.rn = 1
-            LEFT JOIN primary_image pi
-                ON o.objectid = pi.objectid AND pi.rn = 1
-            LEFT JOIN school_terms sc
-                ON o.objectid = sc.objectid
-            LEFT JOIN style_terms st
-                ON o.objectid = st.objectid
-            WHERE o.objectid IS NOT NULL
-        """)
+                    o.objectid                                      AS objectid,
+                    o.title                                         AS title,
+                    NULLIF(o.classification, '')                     AS object_type,
+                    pa.artist_name                                  AS artist_name,
+                    NULLIF(o.displaydate, '')                        AS date_display,
+                    TRY_CAST(o.beginyear AS INTEGER)                 AS date_start,
+                    TRY_CAST(o.endyear AS INTEGER)                   AS date_end,
+                    NULLIF(o.medium, '')                              AS medium,
+                    NULLIF(o.dimensions, '')                          AS dimensions,
+                    NULLIF(o.classification, '')                      AS classification,
+                    CASE WHEN pi.iiifurl IS NOT NULL
+                         THEN pi.iiifurl || '/full/max/0/default.jpg'
+                         ELSE NULL END                               AS image_url,
+                    'https://www.nga.gov/collection/art-object-page.' || o.objectid || '.html'
+                                                                     AS source_url,
+                    o.accessioned = '1'                              AS is_public_domain,
+                    NULLIF(o.departmentabbr, '')                      AS department,
+                    t.culture                                        AS culture,
+                    t.period                                         AS period,
+                    pa.nationality                                   AS artist_nationality,
+                    pa.birth_year                                    AS artist_birth_year,
+                    pa.death_year                                    AS artist_death_year,
+                    pi.iiifthumburl                                  AS thumbnail_url,
+                    NULLIF(o.creditline, '')                          AS credit_line,
+                    NULLIF(o.wikidataid, '')                          AS wikidata_id,
+                    {{
+                        accession_num:                  NULLIF(o.accessionnum, ''),
+                        sub_classification:             NULLIF(o.subclassification, ''),
+                        visual_browser_classification:  NULLIF(o.visualbrowserclassification, ''),
+                        visual_browser_timespan:        NULLIF(o.visualbrowsertimespan, ''),
+                        parent_id:                      NULLIF(o.parentid, ''),
+                        is_virtual:                     o.isvirtual = '1',
+                        portfolio:                      NULLIF(o.portfolio, ''),
+                        series:                         NULLIF(o.series, ''),
+                        volume:                         NULLIF(o.volume, ''),
+                        inscription:                    NULLIF(o.inscription, ''),
+                        markings:                       NULLIF(o.markings, ''),
+                        attribution_inverted:           NULLIF(o.attributioninverted, '')
+                    }}                                               AS extra
+                FROM {read_export(self.objects)} o
+                LEFT JOIN primary_artist pa
+                    ON o.objectid = pa.objectid AND pa.rn = 1
+                LEFT JOIN primary_image pi
+                    ON o.objectid = pi.objectid AND pi.rn = 1
+                LEFT JOIN terms t
+                    ON o.objectid = t.objectid
+                WHERE o.objectid IS NOT NULL
+                ORDER BY o.objectid
+            """)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
         count = self.conn.execute(
             "SELECT count(*) FROM nga_objects"
         ).fetchone()[0]
@@ -9,6 +9,8 @@ from pathlib import Path
 
 import duckdb
 
+from artdig.common import read_export, sql_string
+
 ITEMS_SCHEMA_DDL = """
 CREATE TABLE IF NOT EXISTS nypl_objects (
     uuid                VARCHAR PRIMARY KEY,
@@ -53,21 +55,23 @@ CREATE TABLE IF NOT EXISTS nypl_collections (
 class NYPLIngester:
     """Ingests NYPL public-domain NDJSON data dump into DuckDB."""
 
-    def __init__(self, conn: duckdb.DuckDBPyConnection, data_dir: Path):
+    def __init__(
+        self, conn: duckdb.DuckDBPyConnection, data_dir: Path, items: Path | None = None
+    ):
+        """items is the items NDJSON glob (default) or a glob of its Parquet caches."""
         self.conn = conn
         self.data_dir = data_dir
+        self.items = items or data_dir / "items" / "*.ndjson"
         self._ensure_schema()
 
     def _ensure_schema(self):
-        self.conn.execute(ITEMS_SCHEMA_DDL)
-        self.conn.execute(COLLECTIONS_SCHEMA_DDL)
+        self.conn.execute(ITEMS_SCHEMA_DDL + COLLECTIONS_SCHEMA_DDL)
 
     def run(self):
         self._ingest_items()
         self._ingest_collections()
 
     def _ingest_items(self):
-        items_glob = str(self.data_dir / "items" / "*.ndjson")
         self.conn.execute(f"""
             INSERT OR REPLACE INTO nypl_objects
             SELECT
@@ -130,11 +134,7 @@ class NYPLIngester:
                     identifier_lccn:   "identifierLCCN",
                     identifier_oclc:   "identifierOCLCRLIN"
                 }})                                                   AS extra
-            FROM read_json('{items_glob}',
-                format='newline_delimited',
-                ignore_errors=true,
-                union_by_name=true
-            )
+            FROM {read_export(self.items)}
             WHERE "UUID" IS NOT NULL
         """)
         count = self.conn.execute(
@@ -143,7 +143,7 @@ class NYPLIngester:
         print(f"NYPL: ingested {count:,} items into nypl_objects")
 
     def _ingest_collections(self):
-        collections_file = str(self.data_dir / "collections" / "pd_collections.ndjson")
+        collections_file = sql_string(self.data_dir / "collections" / "pd_collections.ndjson")
         self.conn.execute(f"""
             INSERT OR REPLACE INTO nypl_collections
             SELECT
@@ -172,7 +172,7 @@ class NYPLIngester:
                     publisher:         publisher,
                     place_of_publication: "placeOfPublication"
                 }})                                                   AS extra
-            FROM read_json('{collections_file}',
+            FROM read_json({collections_file},
                 format='newline_delimited',
                 ignore_errors=true,
                 union_by_name=true
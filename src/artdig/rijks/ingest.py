@@ -2,21 +2,40 @@
 
 from __future__ import annotations
 
-import json
+import os
+import re
 import time
 import xml.etree.ElementTree as ET
 import zipfile
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from urllib.request import Request, urlopen
+from typing import IO
+from urllib.request import Request
 
 import duckdb
 
-from artdig.common import now_utc
+from artdig.common import bulk_insert, fetch_bytes, map_bounded, now_utc
+from artdig.rijks.lido import LIDORecord
 
 OAI_ENDPOINT = "https://data.rijksmuseum.nl/oai"
 
 
+def _deflate_xml(xml: str) -> bytes:
+    """Compress record XML for the raw_xml column (~10x smaller)."""
+    return zlib.compress(xml.encode(), 6)
+
+
+def _inflate_xml(raw: bytes) -> str:
+    """Inverse of _deflate_xml; also accepts rows stored uncompressed."""
+    if raw.startswith(b"<"):
+        return raw.decode()
+    return zlib.decompress(raw).decode()
+
+
 def _fmt_duration(seconds: float) -> str:
     """Format seconds as human-readable duration."""
     s = int(seconds)
@@ -66,7 +85,7 @@ CREATE TABLE IF NOT EXISTS rijks_objects (
     source_url          VARCHAR,
     datestamp           TIMESTAMP,
     fetched_at          TIMESTAMP,
-    raw_xml             VARCHAR
+    raw_xml             BLOB  -- zlib-compressed record XML, see _deflate_xml
 );
 CREATE TABLE IF NOT EXISTS rijks_sets (
     set_spec            VARCHAR PRIMARY KEY,
@@ -141,9 +160,7 @@ def _fetch_xml(url: str, timeout: float = 60.0) -> ET.Element:
             "User-Agent": "artdig-rijks-ingester/0.1",
         },
     )
-    with urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    return ET.fromstring(data)
+    return ET.fromstring(fetch_bytes(req, timeout=timeout))
 
 
 def _text(el: ET.Element | None, path: str, lang: str | None = None) -> str | None:
@@ -328,6 +345,149 @@ def _parse_record_metadata(record_el: ET.Element, identifier: str, datestamp: st
     }
 
 
+# --- LIDO bulk ingestion helpers (module level so worker processes can use them) ---
+
+_LIDO_NS = b"http://www.lido-schema.org"
+_XMLNS_RE = re.compile(rb"""\bxmlns(?::(?P<prefix>[\w.-]+))?\s*=\s*(["'])(?P<uri>.*?)\2""")
+
+
+def _xmlns(buf: bytes, end: int) -> dict[bytes, bytes]:
+    """Namespace declarations in buf[:end], prefix (b"" for the default) -> URI.
+
+    A prefix declared more than once keeps its last, innermost binding.
+    """
+    return {m["prefix"] or b"": m["uri"] for m in _XMLNS_RE.finditer(buf, 0, end)}
+
+
+def _lido_prefix(buf: bytes) -> bytes | None:
+    """Prefix of the first declaration in buf binding the LIDO namespace, if any.
+
+    Found by searching for the namespace URI itself rather than scanning
+    every declaration; other mentions of it (e.g. in xsi:schemaLocation)
+    are skipped.
+    """
+    i = buf.find(_LIDO_NS)
+    while i != -1:
+        m = _XMLNS_RE.match(buf, max(buf.rfind(b"xmlns", 0, i), 0))
+        if m and m.span("uri") == (i, i + len(_LIDO_NS)):
+            return m["prefix"] or b""
+        i = buf.find(_LIDO_NS, i + 1)
+    return None
+
+
+def _iter_lido_chunks(
+    stream: IO[bytes], batch_size: int, read_size: int = 1 << 22
+) -> Iterator[bytes]:
+    """Split the raw LIDO dump into standalone XML documents of batch_size records.
+
+    Records are cut out of the byte stream at their lido start tags, under
+    whatever prefix (or default namespace) the dump binds to the LIDO
+    namespace, and re-wrapped with the namespace declarations found before
+    the first record, so each chunk parses on its own (e.g. in a worker
+    process). Raises RuntimeError if the dump holds no record.
+    """
+    buf = b""
+    head = b""
+    open_re: re.Pattern[bytes] | None = None
+    close = b""
+    found = False
+    records: list[bytes] = []
+    while True:
+        data = stream.read(read_size)
+        buf += data
+        pos = 0
+        if open_re is None and (prefix := _lido_prefix(buf)) is not None:
+            tag = (prefix + b":" if prefix else b"") + b"lido"
+            open_re = re.compile(b"<" + re.escape(tag) + rb"[\s>]")
+            close = b"</" + tag + b">"
+        while open_re and (m := open_re.search(buf, pos)):
+            end = buf.find(close, m.end())
+            if end == -1:
+                break
+            if not head:
+                head = b"<chunk" + b"".join(
+                    b" xmlns" + (b":" + p if p else b"") + b'="' + uri + b'"'
+                    for p, uri in _xmlns(buf, m.start()).items()
+                ) + b">"
+            pos = end + len(close)
+            records.append(buf[m.start() : pos])
+            found = True
+            if len(records) >= batch_size:
+                yield head + b"".join(records) + b"</chunk>"
+                records = []
+        buf = buf[pos:]
+        if not data:
+            break
+    if not found:
+        raise RuntimeError("No LIDO records found in the dump")
+    if records:
+        yield head + b"".join(records) + b"</chunk>"
+
+
+def _lido_row(rec: LIDORecord) -> dict | None:
+    """Convert a LIDORecord to a flat dict for insertion. None if no inventory_number."""
+    inv = rec.inventory_number()
+    if inv is None:
+        return None
+
+    title_en, title_nl = rec.titles()
+    desc_en, desc_nl = rec.descriptions()
+    type_en, type_nl, type_aat = rec.object_type()
+    creator = rec.creator()
+    earliest, latest = rec.date_range()
+    h, w, d = rec.primary_dimensions_cm()
+
+    return {
+        "inventory_number": inv,
+        "lido_rec_id": rec.lido_rec_id(),
+        "oai_identifier": rec.oai_identifier(),
+        "title_en": title_en,
+        "title_nl": title_nl,
+        "description_en": desc_en,
+        "description_nl": desc_nl,
+        "object_type_en": type_en,
+        "object_type_nl": type_nl,
+        "object_type_aat_uri": type_aat,
+        "creator_name": creator["name"],
+        "creator_role": creator["role"],
+        "creator_nationality": creator["nationality"],
+        "creator_qualifier": creator["qualifier"],
+        "creator_birth_year": creator["birth_year"],
+        "creator_death_year": creator["death_year"],
+        "earliest_year": earliest,
+        "latest_year": latest,
+        "height_cm": h,
+        "width_cm": w,
+        "depth_cm": d,
+        "materials": rec.materials() or None,
+        "techniques": rec.techniques() or None,
+        "subjects": rec.subjects() or None,
+        "inscriptions": rec.inscriptions() or None,
+        "all_dimensions": rec.all_dimensions() or None,
+        "image_url": rec.image_url(),
+        "rights_url": rec.rights_url(),
+        "credit_line": rec.credit_line(),
+        "source_url": f"https://www.rijksmuseum.nl/nl/collectie/{inv}",
+        "record_metadata_date": rec.record_metadata_date(),
+        "ingested_at": now_utc(),
+    }
+
+
+def _parse_lido_chunk(chunk: bytes) -> tuple[list[dict], int]:
+    """Parse one chunk from _iter_lido_chunks. Returns (rows, skipped)."""
+    rows = []
+    skipped = 0
+    for elem in ET.fromstring(chunk):
+        if elem.tag != LIDO_TAG:
+            continue
+        row = _lido_row(LIDORecord(elem))
+        if row is None:
+            skipped += 1
+        else:
+            rows.append(row)
+    return rows, skipped
+
+
 @dataclass(slots=True)
 class RijksConfig:
     set_spec: str | None = None
@@ -344,10 +504,16 @@ class RijksIngester:
         self._ensure_schema()
 
     def _ensure_schema(self):
-        for stmt in SCHEMA_DDL.strip().split(";"):
-            stmt = stmt.strip()
-            if stmt:
-                self.conn.execute(stmt)
+        self.conn.execute(SCHEMA_DDL)
+        # Databases created before raw_xml became a compressed BLOB.
+        raw_type = self.conn.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'rijks_objects' AND column_name = 'raw_xml'
+        """).fetchone()
+        if raw_type and raw_type[0] == "VARCHAR":
+            self.conn.execute(
+                "ALTER TABLE rijks_objects ALTER raw_xml TYPE BLOB USING encode(raw_xml)"
+            )
 
     def _save_state(self, key: str, value: str):
         self.conn.execute(
@@ -367,8 +533,11 @@ class RijksIngester:
         ).fetchone()
         return row is not None
 
-    def _upsert_record(self, rec: dict):
-        self.conn.execute(
+    def _upsert_records(self, recs: list[dict]):
+        """Upsert parsed records through one prepared statement."""
+        if not recs:
+            return
+        self.conn.executemany(
             """
             INSERT OR REPLACE INTO rijks_objects (
                 identifier, object_number, title, description, object_type,
@@ -380,36 +549,39 @@ class RijksIngester:
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, TRY_CAST(? AS TIMESTAMP), ?, ?)
             """,
             [
-                rec["identifier"],
-                rec["object_number"],
-                rec["title"],
-                rec["description"],
-                rec["object_type"],
-                rec["creator_name"],
-                rec["creator_birth_date"],
-                rec["creator_death_date"],
-                rec["creator_birthplace"],
-                rec["creator_wikidata"],
-                rec["date_created"],
-                rec["dimensions"],
-                rec["medium"],
-                rec["techniques"],
-                rec["image_url"],
-                rec["iiif_service_url"],
-                rec["rights_url"],
-                rec["source_url"],
-                rec["datestamp"],
-                now_utc(),
-                rec["raw_xml"],
+                [
+                    rec["identifier"],
+                    rec["object_number"],
+                    rec["title"],
+                    rec["description"],
+                    rec["object_type"],
+                    rec["creator_name"],
+                    rec["creator_birth_date"],
+                    rec["creator_death_date"],
+                    rec["creator_birthplace"],
+                    rec["creator_wikidata"],
+                    rec["date_created"],
+                    rec["dimensions"],
+                    rec["medium"],
+                    rec["techniques"],
+                    rec["image_url"],
+                    rec["iiif_service_url"],
+                    rec["rights_url"],
+                    rec["source_url"],
+                    rec["datestamp"],
+                    now_utc(),
+                    _deflate_xml(rec["raw_xml"]),
+                ]
+                for rec in recs
             ],
         )
 
-    def _upsert_object_sets(self, identifier: str, set_specs: list[str]):
-        for spec in set_specs:
-            self.conn.execute(
-                "INSERT OR IGNORE INTO rijks_object_sets (identifier, set_spec) VALUES (?, ?)",
-                [identifier, spec],
-            )
+    def _upsert_object_sets(self, memberships: list[tuple[str, str]]):
+        rows = [
+            {"identifier": identifier, "set_spec": spec}
+            for identifier, spec in dict.fromkeys(memberships)
+        ]
+        bulk_insert(self.conn, "rijks_object_sets", rows, ignore=True)
 
     def sync_sets(self):
         """Fetch all OAI-PMH sets and store them in rijks_sets."""
@@ -535,44 +707,60 @@ class RijksIngester:
 
             page_new = 0
             page_skipped = 0
-            for record_el in list_records.findall("oai:record", NS):
-                identifier, datestamp, set_specs = _parse_record_header(record_el)
-                if not identifier:
-                    continue
-
-                total_records_seen += 1
+            memberships: list[tuple[str, str]] = []
+            recs: dict[str, dict] = {}
+            # One transaction per page: records, memberships and the
+            # resumption token commit together.
+            self.conn.begin()
+            try:
+                for record_el in list_records.findall("oai:record", NS):
+                    identifier, datestamp, set_specs = _parse_record_header(record_el)
+                    if not identifier:
+                        continue
 
-                # Always record set memberships
-                self._upsert_object_sets(identifier, set_specs)
+                    total_records_seen += 1
 
-                # Skip full parse if already in DB
-                if self._object_exists(identifier):
-                    page_skipped += 1
-                    continue
+                    # Always record set memberships
+                    memberships += [(identifier, spec) for spec in set_specs]
 
-                rec = _parse_record_metadata(record_el, identifier, datestamp)
-                if rec is None:
-                    continue
-                self._upsert_record(rec)
-                page_new += 1
-
-            total_new += page_new
-            total_skipped += page_skipped
-            pages += 1
+                    # Skip full parse if already in DB
+                    if identifier in recs or self._object_exists(identifier):
+                        page_skipped += 1
+                        continue
 
-            # Extract resumptionToken
-            token_el = list_records.find("oai:resumptionToken", NS)
-            if token_el is not None and token_el.text:
-                resumption_token = token_el.text.strip()
-                self._save_state(state_key, resumption_token)
-                size_str = token_el.get("completeListSize")
-                if size_str:
-                    complete_list_size = int(size_str)
-                url = f"{OAI_ENDPOINT}?verb=ListRecords&resumptionToken={resumption_token}"
-            else:
-                resumption_token = None
-                self._save_state(state_key, "")
-                url = None
+                    rec = _parse_record_metadata(record_el, identifier, datestamp)
+                    if rec is None:
+                        continue
+                    recs[identifier] = rec
+                    page_new += 1
+                self._upsert_records(list(recs.values()))
+                self._upsert_object_sets(memberships)
+
+                total_new += page_new
+                total_skipped += page_skipped
+                pages += 1
+
+                # Extract resumptionToken
+                token_el = list_records.find("oai:resumptionToken", NS)
+                if token_el is not None and token_el.text:
+                    resumption_token = token_el.text.strip()
+                    self._save_state(state_key, resumption_token)
+                    size_str = token_el.get("completeListSize")
+                    if size_str:
+                        complete_list_size = int(size_str)
+                    url = f"{OAI_ENDPOINT}?verb=ListRecords&resumptionToken={resumption_token}"
+                else:
+                    resumption_token = None
+                    self._save_state(state_key, "")
+                    url = None
+            except Exception:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+            # Flush the WAL periodically on long harvests.
+            if pages % 100 == 0:
+                self.conn.execute("CHECKPOINT")
 
             if pages % 5 == 0 or url is None:
                 self._print_progress(
@@ -636,128 +824,65 @@ class RijksIngester:
 
     def _ensure_lido_schema(self):
         """Drop old rijks_objects and create LIDO-tailored schema."""
-        for stmt in LIDO_SCHEMA_DDL.strip().split(";"):
-            stmt = stmt.strip()
-            if stmt:
-                self.conn.execute(stmt)
-
-    def _record_to_row(self, rec) -> dict | None:
-        """Convert a LIDORecord to a flat dict for insertion. None if no inventory_number."""
-        inv = rec.inventory_number()
-        if inv is None:
-            return None
-
-        title_en, title_nl = rec.titles()
-        desc_en, desc_nl = rec.descriptions()
-        type_en, type_nl, type_aat = rec.object_type()
-        creator = rec.creator()
-        earliest, latest = rec.date_range()
-        h, w, d = rec.primary_dimensions_cm()
-
-        mats = rec.materials()
-        techs = rec.techniques()
-        subjs = rec.subjects()
-        inscs = rec.inscriptions()
-        dims = rec.all_dimensions()
-
-        return {
-            "inventory_number": inv,
-            "lido_rec_id": rec.lido_rec_id(),
-            "oai_identifier": rec.oai_identifier(),
-            "title_en": title_en,
-            "title_nl": title_nl,
-            "description_en": desc_en,
-            "description_nl": desc_nl,
-            "object_type_en": type_en,
-            "object_type_nl": type_nl,
-            "object_type_aat_uri": type_aat,
-            "creator_name": creator["name"],
-            "creator_role": creator["role"],
-            "creator_nationality": creator["nationality"],
-            "creator_qualifier": creator["qualifier"],
-            "creator_birth_year": creator["birth_year"],
-            "creator_death_year": creator["death_year"],
-            "earliest_year": earliest,
-            "latest_year": latest,
-            "height_cm": h,
-            "width_cm": w,
-            "depth_cm": d,
-            "materials": json.dumps(mats) if mats else None,
-            "techniques": json.dumps(techs) if techs else None,
-            "subjects": json.dumps(subjs) if subjs else None,
-            "inscriptions": json.dumps(inscs) if inscs else None,
-            "all_dimensions": json.dumps(dims) if dims else None,
-            "image_url": rec.image_url(),
-            "rights_url": rec.rights_url(),
-            "credit_line": rec.credit_line(),
-            "source_url": f"https://www.rijksmuseum.nl/nl/collectie/{inv}",
-            "record_metadata_date": rec.record_metadata_date(),
-            "ingested_at": now_utc(),
-        }
+        self.conn.execute(LIDO_SCHEMA_DDL)
 
     def _insert_lido_batch(self, batch: list[dict]):
         """Batch-insert rows into rijks_objects."""
-        if not batch:
-            return
-        columns = list(batch[0].keys())
-        json_cols = {"materials", "techniques", "subjects", "inscriptions", "all_dimensions"}
-        placeholders = ", ".join(
-            "?::JSON" if c in json_cols else "?" for c in columns
-        )
-        cols_str = ", ".join(columns)
-        sql = f"INSERT OR REPLACE INTO rijks_objects ({cols_str}) VALUES ({placeholders})"
-        rows = [tuple(row[c] for c in columns) for row in batch]
-        self.conn.executemany(sql, rows)
+        # One statement can't replace the same key twice; keep the last row.
+        rows = list({row["inventory_number"]: row for row in batch}.values())
+        bulk_insert(self.conn, "rijks_objects", rows, replace=True)
 
-    def ingest_lido(self, zip_path: Path, *, batch_size: int = 5000):
+    def ingest_lido(
+        self, zip_path: Path, *, batch_size: int = 5000, workers: int | None = None
+    ):
         """Stream-parse the LIDO zip and ingest all records.
 
-        Uses iterparse + elem.clear() for bounded memory on the 12 GB XML.
+        The 12 GB XML is split into chunks of batch_size records which are
+        parsed by `workers` processes (default: one per CPU) while this
+        process does all the inserts, in a single transaction.
         """
-        from artdig.rijks.lido import LIDORecord
-
         self._ensure_lido_schema()
+        workers = workers or os.cpu_count() or 1
 
         t0 = time.monotonic()
         total = 0
         skipped = 0
-        batch: list[dict] = []
+        next_report = 50_000
 
-        with zipfile.ZipFile(zip_path) as zf:
+        with (
+            zipfile.ZipFile(zip_path) as zf,
+            ProcessPoolExecutor(workers) if workers > 1 else nullcontext() as ex,
+        ):
             xml_names = [n for n in zf.namelist() if n.endswith(".xml")]
             if not xml_names:
                 raise RuntimeError(f"No XML file found in {zip_path}")
 
             with zf.open(xml_names[0]) as xml_file:
-                for event, elem in ET.iterparse(xml_file, events=("end",)):
-                    if elem.tag != LIDO_TAG:
-                        continue
-
-                    rec = LIDORecord(elem)
-                    row = self._record_to_row(rec)
-                    elem.clear()
-
-                    if row is None:
-                        skipped += 1
-                        continue
-
-                    batch.append(row)
-                    total += 1
-
-                    if len(batch) >= batch_size:
-                        self._insert_lido_batch(batch)
-                        batch.clear()
-
-                        if total % 50_000 == 0:
+                chunks = _iter_lido_chunks(xml_file, batch_size)
+                if ex is None:
+                    results = map(_parse_lido_chunk, chunks)
+                else:
+                    results = map_bounded(ex, _parse_lido_chunk, chunks, workers * 2)
+
+                self.conn.begin()
+                try:
+                    for rows, n_skipped in results:
+                        self._insert_lido_batch(rows)
+                        total += len(rows)
+                        skipped += n_skipped
+
+                        if total >= next_report:
+                            next_report += 50_000
                             elapsed = time.monotonic() - t0
                             rate = total / elapsed if elapsed > 0 else 0
                             print(
                                 f"Rijks LIDO: {total:,} records "
                                 f"({rate:.0f} rec/s, {_fmt_duration(elapsed)})"
                             )
-
-        # Flush remaining
-        self._insert_lido_batch(batch)
+                except Exception:
+                    self.conn.rollback()
+                    raise
+                self.conn.commit()
 
         elapsed = time.monotonic() - t0
         count = self.conn.execute("SELECT count(*) FROM rijks_objects").fetchone()[0]
@@ -776,13 +901,24 @@ class RijksIngester:
         ).fetchall()
 
         updated = 0
-        for identifier, datestamp, raw_xml in rows:
-            record_el = ET.fromstring(raw_xml)
-            rec = _parse_record_metadata(record_el, identifier, str(datestamp) if datestamp else None)
-            if rec is None:
-                continue
-            self._upsert_record(rec)
-            updated += 1
+        recs: list[dict] = []
+        self.conn.begin()
+        try:
+            for identifier, datestamp, raw_xml in rows:
+                record_el = ET.fromstring(_inflate_xml(raw_xml))
+                rec = _parse_record_metadata(record_el, identifier, str(datestamp) if datestamp else None)
+                if rec is None:
+                    continue
+                recs.append(rec)
+                updated += 1
+                if len(recs) >= 1000:
+                    self._upsert_records(recs)
+                    recs.clear()
+            self._upsert_records(recs)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
 
         with_image = self.conn.execute(
             "SELECT count(*) FROM rijks_objects WHERE image_url IS NOT NULL"
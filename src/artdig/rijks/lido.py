@@ -14,6 +14,9 @@ import xml.etree.ElementTree as ET
 LIDO_NS = "http://www.lido-schema.org"
 NS = {"lido": LIDO_NS}
 L = f"{{{LIDO_NS}}}"
+# Paths below are spelled in Clark notation (f"{L}tag") rather than
+# "lido:tag" + NS: single-step paths then take ElementTree's C fast path
+# instead of the Python ElementPath engine.
 XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
 
 # LIDO type URIs for materials vs techniques
@@ -31,12 +34,12 @@ def _text(el: ET.Element | None, path: str, lang: str | None = None) -> str | No
     if el is None:
         return None
     if lang:
-        for child in el.findall(path, NS):
+        for child in el.findall(path):
             if child.get(XML_LANG) == lang:
                 t = (child.text or "").strip()
                 if t:
                     return t
-    child = el.find(path, NS)
+    child = el.find(path)
     if child is not None:
         t = (child.text or "").strip()
         if t:
@@ -49,7 +52,7 @@ def _all_text(el: ET.Element | None, path: str, lang: str | None = None) -> list
     if el is None:
         return []
     results = []
-    for child in el.findall(path, NS):
+    for child in el.findall(path):
         if lang and child.get(XML_LANG) != lang:
             continue
         t = (child.text or "").strip()
@@ -58,15 +61,18 @@ def _all_text(el: ET.Element | None, path: str, lang: str | None = None) -> list
     return results
 
 
+_AAT_ID_RE = re.compile(r"/aat/\d+")
+
+
 def _aat_uri(concept_el: ET.Element | None) -> str | None:
     """Extract AAT URI from a concept element's conceptID children."""
     if concept_el is None:
         return None
-    for cid in concept_el.findall("lido:conceptID", NS):
+    for cid in concept_el.findall(f"{L}conceptID"):
         text = (cid.text or "").strip()
         if "vocab.getty.edu/aat/" in text:
             # Validate it has an actual ID after the slash
-            if re.search(r"/aat/\d+", text):
+            if _AAT_ID_RE.search(text):
                 return text
     return None
 
@@ -105,18 +111,19 @@ class LIDORecord:
         # Cache frequently accessed wrappers
         self._ident_wrap = (
             self._desc_meta.find(
-                "lido:objectIdentificationWrap", NS
+                f"{L}objectIdentificationWrap"
             )
             if self._desc_meta is not None
             else None
         )
         self._event_wrap = (
-            self._desc_meta.find("lido:eventWrap", NS)
+            self._desc_meta.find(f"{L}eventWrap")
             if self._desc_meta is not None
             else None
         )
         self._creation_event: ET.Element | None = None
         self._creation_event_searched = False
+        self._mat_tech: tuple[tuple[dict, ...], tuple[dict, ...]] | None = None
 
     def _find_creation_event(self) -> ET.Element | None:
         """Find the first Expression creation event."""
@@ -125,19 +132,19 @@ class LIDORecord:
         self._creation_event_searched = True
         if self._event_wrap is None:
             return None
-        for event_set in self._event_wrap.findall("lido:eventSet", NS):
-            event = event_set.find("lido:event", NS)
+        for event_set in self._event_wrap.findall(f"{L}eventSet"):
+            event = event_set.find(f"{L}event")
             if event is None:
                 continue
-            event_type = event.find("lido:eventType", NS)
+            event_type = event.find(f"{L}eventType")
             if event_type is None:
                 continue
             # Check by conceptID or by term text
-            cid = _text(event_type, "lido:conceptID")
+            cid = _text(event_type, f"{L}conceptID")
             if cid and "expression_creation" in cid:
                 self._creation_event = event
                 return event
-            term = _text(event_type, "lido:term", lang="en")
+            term = _text(event_type, f"{L}term", lang="en")
             if term and "creation" in term.lower():
                 self._creation_event = event
                 return event
@@ -150,11 +157,11 @@ class LIDORecord:
         if self._ident_wrap is None:
             return None
         repo = self._ident_wrap.find(
-            "lido:repositoryWrap/lido:repositorySet", NS
+            f"{L}repositoryWrap/{L}repositorySet"
         )
         if repo is None:
             return None
-        return _text(repo, "lido:workID")
+        return _text(repo, f"{L}workID")
 
     def lido_rec_id(self) -> str | None:
         """LIDO record ID (e.g. 'NL-AsdRM/lido/6813')."""
@@ -164,13 +171,13 @@ class LIDORecord:
         """OAI-PMH identifier from recordInfoID (e.g. 'oai:rijksmuseum.nl:SK-A-447')."""
         if self._admin_meta is None:
             return None
-        record_wrap = self._admin_meta.find("lido:recordWrap", NS)
+        record_wrap = self._admin_meta.find(f"{L}recordWrap")
         if record_wrap is None:
             return None
-        info_set = record_wrap.find("lido:recordInfoSet", NS)
+        info_set = record_wrap.find(f"{L}recordInfoSet")
         if info_set is None:
             return None
-        return _text(info_set, "lido:recordInfoID")
+        return _text(info_set, f"{L}recordInfoID")
 
     # --- Titles and Descriptions ---
 
@@ -178,34 +185,34 @@ class LIDORecord:
         """Bilingual titles: (english, dutch)."""
         if self._ident_wrap is None:
             return None, None
-        title_wrap = self._ident_wrap.find("lido:titleWrap", NS)
+        title_wrap = self._ident_wrap.find(f"{L}titleWrap")
         if title_wrap is None:
             return None, None
         # Take the first titleSet (preferred title)
-        title_set = title_wrap.find("lido:titleSet", NS)
+        title_set = title_wrap.find(f"{L}titleSet")
         if title_set is None:
             return None, None
-        en = _text(title_set, "lido:appellationValue", lang="en")
-        nl = _text(title_set, "lido:appellationValue", lang="nl")
+        en = _text(title_set, f"{L}appellationValue", lang="en")
+        nl = _text(title_set, f"{L}appellationValue", lang="nl")
         # If only one language, also check without lang filter
         if en is None and nl is None:
-            en = _text(title_set, "lido:appellationValue")
+            en = _text(title_set, f"{L}appellationValue")
         return en, nl
 
     def descriptions(self) -> tuple[str | None, str | None]:
         """Bilingual descriptions: (english, dutch)."""
         if self._ident_wrap is None:
             return None, None
-        desc_wrap = self._ident_wrap.find("lido:objectDescriptionWrap", NS)
+        desc_wrap = self._ident_wrap.find(f"{L}objectDescriptionWrap")
         if desc_wrap is None:
             return None, None
-        desc_set = desc_wrap.find("lido:objectDescriptionSet", NS)
+        desc_set = desc_wrap.find(f"{L}objectDescriptionSet")
         if desc_set is None:
             return None, None
-        en = _text(desc_set, "lido:descriptiveNoteValue", lang="en")
-        nl = _text(desc_set, "lido:descriptiveNoteValue", lang="nl")
+        en = _text(desc_set, f"{L}descriptiveNoteValue", lang="en")
+        nl = _text(desc_set, f"{L}descriptiveNoteValue", lang="nl")
         if en is None and nl is None:
-            en = _text(desc_set, "lido:descriptiveNoteValue")
+            en = _text(desc_set, f"{L}descriptiveNoteValue")
         return en, nl
 
     # --- Classification ---
@@ -215,18 +222,18 @@ class LIDORecord:
         if self._desc_meta is None:
             return None, None, None
         class_wrap = self._desc_meta.find(
-            "lido:objectClassificationWrap", NS
+            f"{L}objectClassificationWrap"
         )
         if class_wrap is None:
             return None, None, None
-        type_wrap = class_wrap.find("lido:objectWorkTypeWrap", NS)
+        type_wrap = class_wrap.find(f"{L}objectWorkTypeWrap")
         if type_wrap is None:
             return None, None, None
-        owt = type_wrap.find("lido:objectWorkType", NS)
+        owt = type_wrap.find(f"{L}objectWorkType")
         if owt is None:
             return None, None, None
-        en = _text(owt, "lido:term", lang="en")
-        nl = _text(owt, "lido:term", lang="nl")
+        en = _text(owt, f"{L}term", lang="en")
+        nl = _text(owt, f"{L}term", lang="nl")
         uri = _aat_uri(owt)
         return en, nl, uri
 
@@ -250,46 +257,46 @@ class LIDORecord:
             return result
 
         actor_el = event.find(
-            "lido:eventActor/lido:actorInRole", NS
+            f"{L}eventActor/{L}actorInRole"
         )
         if actor_el is None:
             return result
 
-        actor = actor_el.find("lido:actor", NS)
+        actor = actor_el.find(f"{L}actor")
         if actor is not None:
             result["name"] = (
-                _text(actor, "lido:nameActorSet/lido:appellationValue", lang="en")
-                or _text(actor, "lido:nameActorSet/lido:appellationValue", lang="nl")
-                or _text(actor, "lido:nameActorSet/lido:appellationValue")
+                _text(actor, f"{L}nameActorSet/{L}appellationValue", lang="en")
+                or _text(actor, f"{L}nameActorSet/{L}appellationValue", lang="nl")
+                or _text(actor, f"{L}nameActorSet/{L}appellationValue")
             )
             result["nationality"] = (
-                _text(actor, "lido:nationalityActor/lido:term", lang="en")
-                or _text(actor, "lido:nationalityActor/lido:term", lang="nl")
-                or _text(actor, "lido:nationalityActor/lido:term")
+                _text(actor, f"{L}nationalityActor/{L}term", lang="en")
+                or _text(actor, f"{L}nationalityActor/{L}term", lang="nl")
+                or _text(actor, f"{L}nationalityActor/{L}term")
             )
-            vital = actor.find("lido:vitalDatesActor", NS)
+            vital = actor.find(f"{L}vitalDatesActor")
             if vital is not None:
                 result["birth_year"] = _parse_year(
-                    _text(vital, "lido:earliestDate")
+                    _text(vital, f"{L}earliestDate")
                 )
                 result["death_year"] = _parse_year(
-                    _text(vital, "lido:latestDate")
+                    _text(vital, f"{L}latestDate")
                 )
 
         # Role
-        role_el = actor_el.find("lido:roleActor", NS)
+        role_el = actor_el.find(f"{L}roleActor")
         if role_el is not None:
             result["role"] = (
-                _text(role_el, "lido:term", lang="en")
-                or _text(role_el, "lido:term", lang="nl")
-                or _text(role_el, "lido:term")
+                _text(role_el, f"{L}term", lang="en")
+                or _text(role_el, f"{L}term", lang="nl")
+                or _text(role_el, f"{L}term")
             )
 
         # Attribution qualifier
         result["qualifier"] = (
-            _text(actor_el, "lido:attributionQualifierActor", lang="en")
-            or _text(actor_el, "lido:attributionQualifierActor", lang="nl")
-            or _text(actor_el, "lido:attributionQualifierActor")
+            _text(actor_el, f"{L}attributionQualifierActor", lang="en")
+            or _text(actor_el, f"{L}attributionQualifierActor", lang="nl")
+            or _text(actor_el, f"{L}attributionQualifierActor")
         )
 
         return result
@@ -301,34 +308,38 @@ class LIDORecord:
         event = self._find_creation_event()
         if event is None:
             return None, None
-        date_el = event.find("lido:eventDate/lido:date", NS)
+        date_el = event.find(f"{L}eventDate/{L}date")
         if date_el is None:
             return None, None
-        earliest = _parse_year(_text(date_el, "lido:earliestDate"))
-        latest = _parse_year(_text(date_el, "lido:latestDate"))
+        earliest = _parse_year(_text(date_el, f"{L}earliestDate"))
+        latest = _parse_year(_text(date_el, f"{L}latestDate"))
         return earliest, latest
 
     # --- Materials and Techniques ---
 
-    def _materials_and_techniques(self) -> tuple[list[dict], list[dict]]:
-        """Parse all materials and techniques from the creation event."""
+    def _materials_and_techniques(self) -> tuple[tuple[dict, ...], tuple[dict, ...]]:
+        """Parse all materials and techniques from the creation event.
+
+        Memoized; callers get copies via materials() and techniques().
+        """
+        if self._mat_tech is not None:
+            return self._mat_tech
         materials: list[dict] = []
         techniques: list[dict] = []
         event = self._find_creation_event()
-        if event is None:
-            return materials, techniques
+        emts = event.findall(f"{L}eventMaterialsTech") if event is not None else []
 
-        for emt in event.findall("lido:eventMaterialsTech", NS):
-            mt = emt.find("lido:materialsTech", NS)
+        for emt in emts:
+            mt = emt.find(f"{L}materialsTech")
             if mt is None:
                 continue
-            term_el = mt.find("lido:termMaterialsTech", NS)
+            term_el = mt.find(f"{L}termMaterialsTech")
             if term_el is None:
                 continue
 
             entry = {
-                "label_en": _text(term_el, "lido:term", lang="en"),
-                "label_nl": _text(term_el, "lido:term", lang="nl"),
+                "label_en": _text(term_el, f"{L}term", lang="en"),
+                "label_nl": _text(term_el, f"{L}term", lang="nl"),
                 "aat_uri": _aat_uri(term_el),
             }
             # Only include entries that have at least a label
@@ -341,17 +352,18 @@ class LIDORecord:
             else:
                 materials.append(entry)
 
-        return materials, techniques
+        self._mat_tech = tuple(materials), tuple(techniques)
+        return self._mat_tech
 
     def materials(self) -> list[dict]:
         """Materials used: list of {label_en, label_nl, aat_uri}."""
         mats, _ = self._materials_and_techniques()
-        return mats
+        return [dict(m) for m in mats]
 
     def techniques(self) -> list[dict]:
         """Techniques used: list of {label_en, label_nl, aat_uri}."""
         _, techs = self._materials_and_techniques()
-        return techs
+        return [dict(t) for t in techs]
 
     # --- Dimensions ---
 
@@ -360,36 +372,36 @@ class LIDORecord:
         if self._ident_wrap is None:
             return []
         meas_wrap = self._ident_wrap.find(
-            "lido:objectMeasurementsWrap", NS
+            f"{L}objectMeasurementsWrap"
         )
         if meas_wrap is None:
             return []
 
         results = []
-        for meas_set in meas_wrap.findall("lido:objectMeasurementsSet", NS):
-            obj_meas = meas_set.find("lido:objectMeasurements", NS)
+        for meas_set in meas_wrap.findall(f"{L}objectMeasurementsSet"):
+            obj_meas = meas_set.find(f"{L}objectMeasurements")
             if obj_meas is None:
                 continue
 
             # Determine extent (support, frame, sight size, etc.)
             extent = (
-                _text(obj_meas, "lido:extentMeasurements", lang="en")
-                or _text(obj_meas, "lido:extentMeasurements", lang="nl")
-                or _text(obj_meas, "lido:extentMeasurements")
+                _text(obj_meas, f"{L}extentMeasurements", lang="en")
+                or _text(obj_meas, f"{L}extentMeasurements", lang="nl")
+                or _text(obj_meas, f"{L}extentMeasurements")
             )
 
-            for ms in obj_meas.findall("lido:measurementsSet", NS):
+            for ms in obj_meas.findall(f"{L}measurementsSet"):
                 mtype = (
-                    _text(ms, "lido:measurementType", lang="en")
-                    or _text(ms, "lido:measurementType", lang="nl")
-                    or _text(ms, "lido:measurementType")
+                    _text(ms, f"{L}measurementType", lang="en")
+                    or _text(ms, f"{L}measurementType", lang="nl")
+                    or _text(ms, f"{L}measurementType")
                 )
                 unit = (
-                    _text(ms, "lido:measurementUnit", lang="en")
-                    or _text(ms, "lido:measurementUnit", lang="nl")
-                    or _text(ms, "lido:measurementUnit")
+                    _text(ms, f"{L}measurementUnit", lang="en")
+                    or _text(ms, f"{L}measurementUnit", lang="nl")
+                    or _text(ms, f"{L}measurementUnit")
                 )
-                value_str = _text(ms, "lido:measurementValue")
+                value_str = _text(ms, f"{L}measurementValue")
                 if mtype and value_str:
                     try:
                         value = float(value_str)
@@ -447,29 +459,29 @@ class LIDORecord:
         """Subject terms: list of {label, uri, scheme}."""
         if self._desc_meta is None:
             return []
-        rel_wrap = self._desc_meta.find("lido:objectRelationWrap", NS)
+        rel_wrap = self._desc_meta.find(f"{L}objectRelationWrap")
         if rel_wrap is None:
             return []
-        subj_wrap = rel_wrap.find("lido:subjectWrap", NS)
+        subj_wrap = rel_wrap.find(f"{L}subjectWrap")
         if subj_wrap is None:
             return []
 
         results = []
-        for subj_set in subj_wrap.findall("lido:subjectSet", NS):
-            subj = subj_set.find("lido:subject", NS)
+        for subj_set in subj_wrap.findall(f"{L}subjectSet"):
+            subj = subj_set.find(f"{L}subject")
             if subj is None:
                 continue
 
             # Concept subjects (Iconclass, etc.)
-            for concept in subj.findall("lido:subjectConcept", NS):
+            for concept in subj.findall(f"{L}subjectConcept"):
                 label = (
-                    _text(concept, "lido:term", lang="en")
-                    or _text(concept, "lido:term", lang="nl")
-                    or _text(concept, "lido:term")
+                    _text(concept, f"{L}term", lang="en")
+                    or _text(concept, f"{L}term", lang="nl")
+                    or _text(concept, f"{L}term")
                 )
                 uri = None
                 scheme = None
-                for cid in concept.findall("lido:conceptID", NS):
+                for cid in concept.findall(f"{L}conceptID"):
                     uri = (cid.text or "").strip() or None
                     scheme = cid.get(f"{L}source") or None
                     break
@@ -477,38 +489,38 @@ class LIDORecord:
                     results.append({"label": label, "uri": uri, "scheme": scheme})
 
             # Named person subjects
-            for subj_actor in subj.findall("lido:subjectActor", NS):
-                actor = subj_actor.find("lido:actor", NS)
+            for subj_actor in subj.findall(f"{L}subjectActor"):
+                actor = subj_actor.find(f"{L}actor")
                 if actor is not None:
                     name = (
-                        _text(actor, "lido:nameActorSet/lido:appellationValue", lang="en")
-                        or _text(actor, "lido:nameActorSet/lido:appellationValue", lang="nl")
-                        or _text(actor, "lido:nameActorSet/lido:appellationValue")
+                        _text(actor, f"{L}nameActorSet/{L}appellationValue", lang="en")
+                        or _text(actor, f"{L}nameActorSet/{L}appellationValue", lang="nl")
+                        or _text(actor, f"{L}nameActorSet/{L}appellationValue")
                     )
                     if name:
                         results.append({"label": name, "uri": None, "scheme": "person"})
 
             # Place subjects
-            for subj_place in subj.findall("lido:subjectPlace", NS):
-                place = subj_place.find("lido:place", NS)
+            for subj_place in subj.findall(f"{L}subjectPlace"):
+                place = subj_place.find(f"{L}place")
                 if place is not None:
                     name = (
-                        _text(place, "lido:namePlaceSet/lido:appellationValue", lang="en")
-                        or _text(place, "lido:namePlaceSet/lido:appellationValue", lang="nl")
-                        or _text(place, "lido:namePlaceSet/lido:appellationValue")
+                        _text(place, f"{L}namePlaceSet/{L}appellationValue", lang="en")
+                        or _text(place, f"{L}namePlaceSet/{L}appellationValue", lang="nl")
+                        or _text(place, f"{L}namePlaceSet/{L}appellationValue")
                     )
                     place_uri = None
-                    for pid in place.findall("lido:placeID", NS):
+                    for pid in place.findall(f"{L}placeID"):
                         place_uri = (pid.text or "").strip() or None
                         break
                     if name or place_uri:
                         results.append({"label": name, "uri": place_uri, "scheme": "place"})
 
             # Event subjects
-            for subj_event in subj.findall("lido:subjectEvent", NS):
-                evt = subj_event.find("lido:event", NS)
+            for subj_event in subj.findall(f"{L}subjectEvent"):
+                evt = subj_event.find(f"{L}event")
                 if evt is not None:
-                    name = _text(evt, "lido:eventName/lido:appellationValue")
+                    name = _text(evt, f"{L}eventName/{L}appellationValue")
                     if name:
                         results.append({"label": name, "uri": None, "scheme": "event"})
 
@@ -520,17 +532,17 @@ class LIDORecord:
         """Inscriptions: list of {text, description}."""
         if self._ident_wrap is None:
             return []
-        insc_wrap = self._ident_wrap.find("lido:inscriptionsWrap", NS)
+        insc_wrap = self._ident_wrap.find(f"{L}inscriptionsWrap")
         if insc_wrap is None:
             return []
 
         results = []
-        for insc in insc_wrap.findall("lido:inscriptions", NS):
-            text = _text(insc, "lido:inscriptionTranscription")
+        for insc in insc_wrap.findall(f"{L}inscriptions"):
+            text = _text(insc, f"{L}inscriptionTranscription")
             desc = (
-                _text(insc, "lido:inscriptionDescription/lido:descriptiveNoteValue", lang="en")
-                or _text(insc, "lido:inscriptionDescription/lido:descriptiveNoteValue", lang="nl")
-                or _text(insc, "lido:inscriptionDescription/lido:descriptiveNoteValue")
+                _text(insc, f"{L}inscriptionDescription/{L}descriptiveNoteValue", lang="en")
+                or _text(insc, f"{L}inscriptionDescription/{L}descriptiveNoteValue", lang="nl")
+                or _text(insc, f"{L}inscriptionDescription/{L}descriptiveNoteValue")
             )
             if text or desc:
                 results.append({"text": text, "description": desc})
@@ -543,32 +555,32 @@ class LIDORecord:
         """Image URL from resourceWrap (Google CDN)."""
         if self._admin_meta is None:
             return None
-        res_wrap = self._admin_meta.find("lido:resourceWrap", NS)
+        res_wrap = self._admin_meta.find(f"{L}resourceWrap")
         if res_wrap is None:
             return None
-        res_set = res_wrap.find("lido:resourceSet", NS)
+        res_set = res_wrap.find(f"{L}resourceSet")
         if res_set is None:
             return None
-        rep = res_set.find("lido:resourceRepresentation", NS)
+        rep = res_set.find(f"{L}resourceRepresentation")
         if rep is None:
             return None
-        url = _text(rep, "lido:linkResource")
+        url = _text(rep, f"{L}linkResource")
         return url if url else None
 
     def rights_url(self) -> str | None:
         """Rights URL for the work (CC license)."""
         if self._admin_meta is None:
             return None
-        rights_wrap = self._admin_meta.find("lido:rightsWorkWrap", NS)
+        rights_wrap = self._admin_meta.find(f"{L}rightsWorkWrap")
         if rights_wrap is None:
             return None
-        rights_set = rights_wrap.find("lido:rightsWorkSet", NS)
+        rights_set = rights_wrap.find(f"{L}rightsWorkSet")
         if rights_set is None:
             return None
-        rights_type = rights_set.find("lido:rightsType", NS)
+        rights_type = rights_set.find(f"{L}rightsType")
         if rights_type is None:
             return None
-        for cid in rights_type.findall("lido:conceptID", NS):
+        for cid in rights_type.findall(f"{L}conceptID"):
             text = (cid.text or "").strip()
             if text:
                 return text
@@ -578,22 +590,22 @@ class LIDORecord:
         """Credit line from record rights."""
         if self._admin_meta is None:
             return None
-        record_wrap = self._admin_meta.find("lido:recordWrap", NS)
+        record_wrap = self._admin_meta.find(f"{L}recordWrap")
         if record_wrap is None:
             return None
-        record_rights = record_wrap.find("lido:recordRights", NS)
+        record_rights = record_wrap.find(f"{L}recordRights")
         if record_rights is None:
             return None
-        return _text(record_rights, "lido:creditLine")
+        return _text(record_rights, f"{L}creditLine")
 
     def record_metadata_date(self) -> str | None:
         """Last modification date of the record metadata."""
         if self._admin_meta is None:
             return None
-        record_wrap = self._admin_meta.find("lido:recordWrap", NS)
+        record_wrap = self._admin_meta.find(f"{L}recordWrap")
         if record_wrap is None:
             return None
-        info_set = record_wrap.find("lido:recordInfoSet", NS)
+        info_set = record_wrap.find(f"{L}recordInfoSet")
         if info_set is None:
             return None
-        return _text(info_set, "lido:recordMetadataDate")
+        return _text(info_set, f"{L}recordMetadataDate")
@@ -0,0 +1,124 @@
+"""Shared fixtures: an in-memory DuckDB database, and a local HTTP server
+for the download and fetch tests.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import duckdb
+import pytest
+
+
+@pytest.fixture
+def conn() -> Iterator[duckdb.DuckDBPyConnection]:
+    conn = duckdb.connect()
+    yield conn
+    conn.close()
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str]
+    client_port: int
+
+
+@dataclass
+class FakeServer:
+    """What the local server serves, and what it was asked.
+
+    files are served with an ETag and a Last-Modified of mtime, honouring
+    HEAD, Range, If-None-Match and If-Modified-Since (ranges only while
+    accept_ranges is set). A path listed in script
+    answers with its queued (status, headers, body) responses first.
+    """
+
+    url: str
+    files: dict[str, bytes] = field(default_factory=dict)
+    script: dict[str, list[tuple[int, dict[str, str], bytes]]] = field(default_factory=dict)
+    accept_ranges: bool = True
+    mtime: float = 1_700_000_000
+    requests: list[Request] = field(default_factory=list)
+
+    def gets(self, path: str) -> list[Request]:
+        return [r for r in self.requests if r.method == "GET" and r.path == path]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def _send(self, status: int, headers: dict[str, str], body: bytes, head: bool):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _serve(self, head: bool):
+        fake: FakeServer = self.server.fake  # type: ignore[attr-defined]
+        fake.requests.append(
+            Request(self.command, self.path, dict(self.headers), self.client_address[1])
+        )
+        if fake.script.get(self.path):
+            self._send(*fake.script[self.path].pop(0), head)
+            return
+        data = fake.files.get(self.path)
+        if data is None:
+            self._send(404, {}, b"", head)
+            return
+        headers = {
+            "ETag": f'"{zlib.crc32(data):08x}"',
+            "Last-Modified": formatdate(fake.mtime, usegmt=True),
+        }
+        if fake.accept_ranges:
+            headers["Accept-Ranges"] = "bytes"
+        since = self.headers.get("If-Modified-Since")
+        if "If-None-Match" in self.headers:
+            not_modified = self.headers["If-None-Match"] == headers["ETag"]
+        else:
+            not_modified = bool(since) and parsedate_to_datetime(since).timestamp() >= fake.mtime
+        if not_modified:
+            self._send(304, headers, b"", head=True)
+            return
+        rng = self.headers.get("Range")
+        if rng and fake.accept_ranges:
+            start, end = re.fullmatch(r"bytes=(\d+)-(\d*)", rng).groups()
+            start, end = int(start), int(end) if end else len(data) - 1
+            if start >= len(data):
+                self._send(416, {"Content-Range": f"bytes */{len(data)}"}, b"", head)
+                return
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            self._send(206, headers, data[start : end + 1], head)
+            return
+        self._send(200, headers, data, head)
+
+
+@pytest.fixture
+def http_server() -> Iterator[FakeServer]:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    fake = FakeServer(f"http://127.0.0.1:{httpd.server_address[1]}")
+    httpd.fake = fake  # type: ignore[attr-defined]
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield fake
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,187 @@
+"""Tests for the ARTIC JSON dump ingest modes against a small generated dump."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from artdig.artic.ingest import EXTRA_TYPE, SCHEMA_DDL, ArticIngester
+
+
+def _write_artwork(data_dir: Path, id: int, title: str, **fields) -> Path:
+    path = data_dir / "artic-api-data" / "json" / "artworks" / f"{id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"id": id, "title": title, **fields}))
+    return path
+
+
+def _titles(conn) -> list[tuple]:
+    return conn.execute("SELECT id, title FROM artic_objects ORDER BY id").fetchall()
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    _write_artwork(
+        tmp_path, 1, "Nighthawks",
+        image_id="abc", artist_title="Edward Hopper", style_titles=["Realism"],
+        is_public_domain=False, date_start="1942",
+    )
+    _write_artwork(tmp_path, 2, "The Bedroom", is_public_domain=True)
+    _write_artwork(tmp_path, 3, "")
+    return tmp_path
+
+
+def _run(conn, data_dir: Path, mode: str = "replace"):
+    ArticIngester(conn, data_dir, mode=mode).run()
+
+
+class TestReplace:
+    def test_maps_columns(self, conn, data_dir: Path):
+        _run(conn, data_dir)
+        row = conn.execute("""
+            SELECT title, image_url, source_url, is_public_domain, date_start,
+                   extra.artist_title, extra.style_titles
+            FROM artic_objects WHERE id = 1
+        """).fetchone()
+        assert row == (
+            "Nighthawks",
+            "https://www.artic.edu/iiif/2/abc/full/843,/0/default.jpg",
+            "https://www.artic.edu/artworks/1",
+            False,
+            1942,
+            "Edward Hopper",
+            ["Realism"],
+        )
+        assert _titles(conn) == [(1, "Nighthawks"), (2, "The Bedroom"), (3, None)]
+
+    def test_reload_is_idempotent(self, conn, data_dir: Path):
+        _run(conn, data_dir)
+        _run(conn, data_dir)
+        assert conn.execute("SELECT count(*) FROM artic_objects").fetchone() == (3,)
+
+    def test_reload_drops_removed_rows(self, conn, data_dir: Path):
+        _run(conn, data_dir)
+        (data_dir / "artic-api-data" / "json" / "artworks" / "2.json").unlink()
+        _write_artwork(data_dir, 1, "Nighthawks (1942)")
+        _run(conn, data_dir)
+        assert _titles(conn) == [(1, "Nighthawks (1942)"), (3, None)]
+
+    def test_records_watermark(self, conn, data_dir: Path):
+        _run(conn, data_dir)
+        assert conn.execute("SELECT max_id FROM artic_ingest_state").fetchall() == [(3,)]
+
+
+class TestAppend:
+    def test_adds_only_missing_ids(self, conn, data_dir: Path):
+        _run(conn, data_dir)
+        conn.execute("DELETE FROM artic_objects WHERE id = 2")
+        _write_artwork(data_dir, 1, "Changed")
+        _write_artwork(data_dir, 4, "American Gothic")
+        _run(conn, data_dir, "append")
+        assert _titles(conn) == [
+            (1, "Nighthawks"), (2, "The Bedroom"), (3, None), (4, "American Gothic")
+        ]
+
+
+class TestIncremental:
+    def test_adds_only_ids_above_watermark(self, conn, data_dir: Path):
+        _run(conn, data_dir)
+        conn.execute("DELETE FROM artic_objects WHERE id = 2")
+        _write_artwork(data_dir, 5, "Paris Street; Rainy Day")
+        _run(conn, data_dir, "incremental")
+        assert _titles(conn) == [(1, "Nighthawks"), (3, None), (5, "Paris Street; Rainy Day")]
+        assert conn.execute("SELECT max_id FROM artic_ingest_state").fetchall() == [(5,)]
+
+    def test_first_run_loads_everything(self, conn, data_dir: Path):
+        _run(conn, data_dir, "incremental")
+        assert len(_titles(conn)) == 3
+
+
+def _touch(path: Path, mtime: float):
+    os.utime(path, (mtime, mtime))
+
+
+def _recorded(conn) -> dict[str, list[int]]:
+    rows = conn.execute("SELECT path, ids FROM artic_ingested_files").fetchall()
+    return {Path(path).name: ids for path, ids in rows}
+
+
+class TestChanged:
+    def test_first_run_matches_replace(self, conn, data_dir: Path):
+        replaced = duckdb.connect()
+        _run(conn, data_dir, "changed")
+        _run(replaced, data_dir)
+        assert _titles(conn) == _titles(replaced)
+        assert _recorded(conn) == {"1.json": [1], "2.json": [2], "3.json": [3]}
+
+    def test_reloads_modified_files_only(self, conn, data_dir: Path):
+        _run(conn, data_dir, "changed")
+        path = _write_artwork(data_dir, 1, "Nighthawks (1942)")
+        _touch(path, 2_000_000_000)
+        # Edited in the table but not on disk: an unchanged file isn't reread.
+        conn.execute("UPDATE artic_objects SET title = 'local' WHERE id = 2")
+        _run(conn, data_dir, "changed")
+        assert _titles(conn) == [(1, "Nighthawks (1942)"), (2, "local"), (3, None)]
+
+    def test_drops_rows_of_removed_files(self, conn, data_dir: Path):
+        _run(conn, data_dir, "changed")
+        (data_dir / "artic-api-data" / "json" / "artworks" / "2.json").unlink()
+        _run(conn, data_dir, "changed")
+        assert _titles(conn) == [(1, "Nighthawks"), (3, None)]
+        assert set(_recorded(conn)) == {"1.json", "3.json"}
+
+    def test_id_moved_to_another_file(self, conn, data_dir: Path):
+        _run(conn, data_dir, "changed")
+        artworks = data_dir / "artic-api-data" / "json" / "artworks"
+        (artworks / "2.json").rename(artworks / "two.json")
+        _run(conn, data_dir, "changed")
+        assert _titles(conn) == [(1, "Nighthawks"), (2, "The Bedroom"), (3, None)]
+        assert _recorded(conn)["two.json"] == [2]
+
+    def test_file_without_rows_is_recorded(self, conn, data_dir: Path):
+        path = data_dir / "artic-api-data" / "json" / "artworks" / "stub.json"
+        path.write_text('{"id": null}')
+        _run(conn, data_dir, "changed")
+        assert _recorded(conn)["stub.json"] == []
+        assert len(_titles(conn)) == 3
+
+    def test_legacy_file_records_are_reloaded(self, conn, data_dir: Path):
+        _run(conn, data_dir, "changed")
+        # Records from before ids were kept, including one for a file now gone.
+        conn.execute("DROP TABLE artic_ingested_files")
+        conn.execute("CREATE TABLE artic_ingested_files (path VARCHAR PRIMARY KEY, mtime DOUBLE)")
+        for path in (data_dir / "artic-api-data" / "json" / "artworks").iterdir():
+            conn.execute(
+                "INSERT INTO artic_ingested_files VALUES (?, ?)", [str(path), path.stat().st_mtime]
+            )
+        (data_dir / "artic-api-data" / "json" / "artworks" / "3.json").unlink()
+        _run(conn, data_dir, "changed")
+        assert _titles(conn) == [(1, "Nighthawks"), (2, "The Bedroom")]
+        assert _recorded(conn) == {"1.json": [1], "2.json": [2]}
+
+
+class TestSchema:
+    def test_invalid_mode(self, conn, data_dir: Path):
+        with pytest.raises(ValueError, match="Invalid mode"):
+            ArticIngester(conn, data_dir, mode="upsert")
+
+    def test_migrates_json_extra(self, conn, data_dir: Path):
+        old_ddl = SCHEMA_DDL.replace(EXTRA_TYPE, "JSON")
+        assert old_ddl != SCHEMA_DDL
+        conn.execute(old_ddl)
+        # What the JSON ingest wrote: to_json of the full struct, nulls included.
+        conn.execute(f"""
+            INSERT INTO artic_objects (id, extra)
+            VALUES (9, to_json({{artist_title: 'Monet', gallery_id: 240}}::{EXTRA_TYPE}))
+        """)
+        ArticIngester(conn, data_dir)
+        row = conn.execute(
+            "SELECT typeof(extra), extra.artist_title, extra.gallery_id, extra.color "
+            "FROM artic_objects"
+        ).fetchone()
+        assert row[0].startswith("STRUCT(")
+        assert row[1:] == ("Monet", 240, None)
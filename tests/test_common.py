@@ -0,0 +1,167 @@
+"""Tests for the DuckDB helpers in artdig.common."""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from artdig.common import DuckDBPool, bulk_insert, open_db, sql_string
+
+
+@pytest.fixture
+def pool():
+    pool = DuckDBPool()
+    yield pool
+    pool.close()
+
+
+# ---------------------------------------------------------------------------
+# Connections
+# ---------------------------------------------------------------------------
+
+
+class TestDuckDBPool:
+    def test_cursors_share_one_database(self, pool: DuckDBPool, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        pool.get(path).execute("CREATE TABLE t AS SELECT 42 AS x")
+        assert pool.get(path).execute("SELECT x FROM t").fetchone() == (42,)
+
+    def test_closing_a_cursor_keeps_the_database(self, pool: DuckDBPool, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        cur = pool.get(path)
+        cur.execute("CREATE TABLE t AS SELECT 1 AS x")
+        cur.close()
+        assert pool.get(path).execute("SELECT count(*) FROM t").fetchone() == (1,)
+
+    def test_release_lets_another_instance_open(self, pool: DuckDBPool, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        pool.get(path).execute("CREATE TABLE t AS SELECT 7 AS x")
+        pool.release(path)
+        with duckdb.connect(str(path)) as conn:
+            assert conn.execute("SELECT x FROM t").fetchone() == (7,)
+            conn.execute("INSERT INTO t VALUES (8)")
+        # The next get reopens the file and sees the other instance's write.
+        assert pool.get(path).execute("SELECT sum(x) FROM t").fetchone() == (15,)
+
+    def test_read_only_instance_is_reused(self, pool: DuckDBPool, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        pool.get(path).execute("CREATE TABLE t AS SELECT 3 AS x")
+        assert pool.get_read_only(path).execute("SELECT x FROM t").fetchone() == (3,)
+        db = pool._read_only[path]
+        pool.get_read_only(path).close()
+        assert pool._read_only[path] is db
+        with pytest.raises(duckdb.InvalidInputException):
+            pool.get_read_only(path).execute("INSERT INTO t VALUES (4)")
+
+    def test_switching_modes_reopens(self, pool: DuckDBPool, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        pool.get(path).execute("CREATE TABLE t AS SELECT 1 AS x")
+        pool.get_read_only(path)
+        assert path not in pool._dbs
+        pool.get(path).execute("INSERT INTO t VALUES (2)")
+        assert path not in pool._read_only
+        assert pool.get_read_only(path).execute("SELECT sum(x) FROM t").fetchone() == (3,)
+
+    def test_release_closes_read_only_instance(self, pool: DuckDBPool, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        pool.get(path).execute("CREATE TABLE t AS SELECT 1 AS x")
+        pool.get_read_only(path)
+        pool.release(path)
+        with duckdb.connect(str(path)) as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+
+    def test_release_unknown_path_is_noop(self, pool: DuckDBPool, tmp_path: Path):
+        pool.release(tmp_path / "never.duckdb")
+
+    def test_close_releases_everything(self, pool: DuckDBPool, tmp_path: Path):
+        paths = [tmp_path / "a.duckdb", tmp_path / "b.duckdb"]
+        for path in paths:
+            pool.get(path).execute("CREATE TABLE t AS SELECT 1 AS x")
+        pool.close()
+        for path in paths:
+            with duckdb.connect(str(path), read_only=True) as conn:
+                assert conn.execute("SELECT x FROM t").fetchone() == (1,)
+
+
+class TestOpenDb:
+    def test_creates_parent_directory(self, tmp_path: Path):
+        path = tmp_path / "nested" / "a.duckdb"
+        with open_db(path, threads=2) as conn:
+            assert conn.execute("SELECT current_setting('threads')").fetchone() == (2,)
+        assert path.exists()
+
+    def test_read_only_rejects_writes(self, tmp_path: Path):
+        path = tmp_path / "a.duckdb"
+        with open_db(path) as conn:
+            conn.execute("CREATE TABLE t AS SELECT 1 AS x")
+        with open_db(path, read_only=True) as conn:
+            assert conn.execute("SELECT x FROM t").fetchone() == (1,)
+            with pytest.raises(duckdb.InvalidInputException):
+                conn.execute("INSERT INTO t VALUES (2)")
+
+
+# ---------------------------------------------------------------------------
+# bulk_insert
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def conn(conn):
+    conn.execute("""
+        CREATE TABLE objects (
+            id         INTEGER PRIMARY KEY,
+            title      VARCHAR,
+            tags       JSON,
+            fetched_at TIMESTAMP
+        )
+    """)
+    return conn
+
+
+def _titles(conn) -> list[tuple]:
+    return conn.execute("SELECT id, title FROM objects ORDER BY id").fetchall()
+
+
+class TestBulkInsert:
+    def test_inserts_rows(self, conn):
+        bulk_insert(conn, "objects", [{"id": 1, "title": "a"}, {"id": 2, "title": None}])
+        assert _titles(conn) == [(1, "a"), (2, None)]
+
+    def test_empty_is_noop(self, conn):
+        bulk_insert(conn, "objects", [])
+        assert _titles(conn) == []
+
+    def test_duplicate_key_raises(self, conn):
+        bulk_insert(conn, "objects", [{"id": 1, "title": "a"}])
+        with pytest.raises(duckdb.ConstraintException):
+            bulk_insert(conn, "objects", [{"id": 1, "title": "b"}])
+
+    def test_replace(self, conn):
+        bulk_insert(conn, "objects", [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}])
+        rows = [{"id": 1, "title": "c"}, {"id": 3, "title": "d"}]
+        bulk_insert(conn, "objects", rows, replace=True)
+        assert _titles(conn) == [(1, "c"), (2, "b"), (3, "d")]
+
+    def test_ignore(self, conn):
+        bulk_insert(conn, "objects", [{"id": 1, "title": "a"}])
+        rows = [{"id": 1, "title": "c"}, {"id": 3, "title": "d"}]
+        bulk_insert(conn, "objects", rows, ignore=True)
+        assert _titles(conn) == [(1, "a"), (3, "d")]
+
+    def test_json_and_timestamp_columns(self, conn):
+        fetched = datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+        tags = [{"term": "O'Keeffe", "aat": None}, "plain"]
+        bulk_insert(conn, "objects", [{"id": 1, "tags": tags, "fetched_at": fetched}])
+        raw, ts = conn.execute("SELECT tags, fetched_at FROM objects").fetchone()
+        assert json.loads(raw) == tags
+        assert ts == datetime(2024, 5, 1, 12, 30)
+
+
+def test_sql_string_escapes_quotes():
+    assert sql_string(Path("/data/o'brien.csv")) == "'/data/o''brien.csv'"
+    value = "it's"
+    assert duckdb.sql(f"SELECT {sql_string(value)}").fetchone() == (value,)
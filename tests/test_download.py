@@ -0,0 +1,141 @@
+"""Tests for common.download against a local HTTP server."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from artdig.common import download
+
+DATA = bytes(range(256)) * 64
+
+
+class TestDownload:
+    def test_fresh_download(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        assert download(f"{http_server.url}/dump.zip", dest) == dest
+        assert dest.read_bytes() == DATA
+        assert not dest.with_name("dump.zip.part").exists()
+        meta = json.loads(dest.with_name("dump.zip.meta.json").read_text())
+        assert meta["etag"].startswith('"')
+
+    def test_resumes_from_part(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        dest.with_name("dump.zip.part").write_bytes(DATA[:1000])
+        download(f"{http_server.url}/dump.zip", dest)
+        assert dest.read_bytes() == DATA
+        (req,) = http_server.gets("/dump.zip")
+        assert req.headers["Range"] == "bytes=1000-"
+
+    def test_part_already_complete(self, http_server, tmp_path: Path):
+        # The server answers 416: nothing lies past the end of the file.
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        dest.with_name("dump.zip.part").write_bytes(DATA)
+        assert download(f"{http_server.url}/dump.zip", dest) == dest
+        assert dest.read_bytes() == DATA
+
+    def test_restarts_when_range_ignored(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        http_server.accept_ranges = False
+        dest = tmp_path / "dump.zip"
+        dest.with_name("dump.zip.part").write_bytes(b"stale bytes")
+        download(f"{http_server.url}/dump.zip", dest)
+        assert dest.read_bytes() == DATA
+
+    def test_not_modified(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        url = f"{http_server.url}/dump.zip"
+        download(url, dest)
+        mtime = dest.stat().st_mtime_ns
+        assert download(url, dest) is None
+        assert dest.stat().st_mtime_ns == mtime
+        revalidation = http_server.gets("/dump.zip")[-1]
+        assert revalidation.headers["If-None-Match"] == json.loads(
+            dest.with_name("dump.zip.meta.json").read_text()
+        )["etag"]
+
+    def test_modified_is_fetched_again(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        url = f"{http_server.url}/dump.zip"
+        download(url, dest)
+        http_server.files["/dump.zip"] = DATA[::-1]
+        assert download(url, dest) == dest
+        assert dest.read_bytes() == DATA[::-1]
+
+    def test_file_without_meta_older_than_server_is_fetched(
+        self, http_server, tmp_path: Path
+    ):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        dest.write_bytes(b"old")
+        os.utime(dest, (http_server.mtime - 60, http_server.mtime - 60))
+        assert download(f"{http_server.url}/dump.zip", dest) == dest
+        assert dest.read_bytes() == DATA
+        (req,) = http_server.gets("/dump.zip")
+        assert "If-None-Match" not in req.headers
+        assert "If-Modified-Since" in req.headers
+        assert os.path.exists(dest.with_name("dump.zip.meta.json"))
+
+    def test_file_without_meta_revalidated_by_mtime(self, http_server, tmp_path: Path):
+        # Fetched before sidecars were kept: the 304 leaves the file and
+        # records the server's validators for the next run.
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        dest.write_bytes(DATA)
+        os.utime(dest, (http_server.mtime + 60, http_server.mtime + 60))
+        assert download(f"{http_server.url}/dump.zip", dest, connections=4) is None
+        assert [r.method for r in http_server.requests] == ["GET"]
+        meta = json.loads(dest.with_name("dump.zip.meta.json").read_text())
+        assert meta["etag"].startswith('"')
+        assert download(f"{http_server.url}/dump.zip", dest) is None
+        assert http_server.gets("/dump.zip")[-1].headers["If-None-Match"] == meta["etag"]
+
+
+class TestRangedDownload:
+    def test_parallel_ranges(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        assert download(f"{http_server.url}/dump.zip", dest, connections=4) == dest
+        assert dest.read_bytes() == DATA
+        assert not dest.with_name("dump.zip.seg").exists()
+        assert [r.method for r in http_server.requests].count("HEAD") == 1
+        ranges = sorted(
+            (r.headers["Range"] for r in http_server.gets("/dump.zip")),
+            key=lambda h: int(h[6:].split("-")[0]),
+        )
+        assert ranges == [
+            "bytes=0-4095", "bytes=4096-8191", "bytes=8192-12287", "bytes=12288-16383"
+        ]
+        assert json.loads(dest.with_name("dump.zip.meta.json").read_text())["etag"]
+
+    def test_more_connections_than_bytes(self, http_server, tmp_path: Path):
+        http_server.files["/tiny"] = b"abc"
+        dest = tmp_path / "tiny"
+        download(f"{http_server.url}/tiny", dest, connections=8)
+        assert dest.read_bytes() == b"abc"
+        assert len(http_server.gets("/tiny")) == 3
+
+    def test_falls_back_without_range_support(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        http_server.accept_ranges = False
+        dest = tmp_path / "dump.zip"
+        download(f"{http_server.url}/dump.zip", dest, connections=4)
+        assert dest.read_bytes() == DATA
+        (req,) = http_server.gets("/dump.zip")
+        assert "Range" not in req.headers
+
+    def test_resume_stays_single_connection(self, http_server, tmp_path: Path):
+        http_server.files["/dump.zip"] = DATA
+        dest = tmp_path / "dump.zip"
+        dest.with_name("dump.zip.part").write_bytes(DATA[:100])
+        download(f"{http_server.url}/dump.zip", dest, connections=4)
+        assert dest.read_bytes() == DATA
+        assert [(r.method, r.headers.get("Range")) for r in http_server.requests] == [
+            ("GET", "bytes=100-")
+        ]
@@ -0,0 +1,88 @@
+"""Tests for common.fetch_bytes and fetch_all against a local HTTP server."""
+
+from __future__ import annotations
+
+from urllib.error import HTTPError
+from urllib.request import Request
+
+import pytest
+
+from artdig import common
+from artdig.common import fetch_all, fetch_bytes
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record retry backoffs instead of sleeping."""
+    slept: list[float] = []
+    monkeypatch.setattr(common.time, "sleep", slept.append)
+    return slept
+
+
+def _get(server, path: str, **kwargs) -> bytes:
+    return fetch_bytes(Request(f"{server.url}{path}"), timeout=5, **kwargs)
+
+
+class TestFetchBytes:
+    def test_returns_body(self, http_server):
+        http_server.files["/obj/1"] = b'{"id": 1}'
+        assert _get(http_server, "/obj/1") == b'{"id": 1}'
+
+    def test_sends_request_headers(self, http_server):
+        http_server.files["/obj/1"] = b"{}"
+        req = Request(f"{http_server.url}/obj/1", headers={"Accept": "application/ld+json"})
+        fetch_bytes(req, timeout=5)
+        assert http_server.gets("/obj/1")[0].headers["Accept"] == "application/ld+json"
+
+    def test_retries_429_with_retry_after(self, http_server, sleeps):
+        http_server.files["/obj/1"] = b"ok"
+        http_server.script["/obj/1"] = [(429, {"Retry-After": "7"}, b"slow down")]
+        assert _get(http_server, "/obj/1") == b"ok"
+        assert sleeps == [7.0]
+
+    def test_retries_503_with_backoff(self, http_server, sleeps):
+        http_server.files["/obj/1"] = b"ok"
+        http_server.script["/obj/1"] = [(503, {}, b"")] * 3
+        assert _get(http_server, "/obj/1") == b"ok"
+        assert sleeps == [1, 2, 4]
+
+    def test_gives_up_after_retries(self, http_server, sleeps):
+        http_server.script["/obj/1"] = [(503, {}, b"down")] * 3
+        with pytest.raises(HTTPError) as exc:
+            _get(http_server, "/obj/1", retries=2)
+        assert exc.value.code == 503
+        assert exc.value.read() == b"down"
+        assert len(http_server.gets("/obj/1")) == 3
+
+    def test_client_error_is_not_retried(self, http_server, sleeps):
+        with pytest.raises(HTTPError) as exc:
+            _get(http_server, "/missing")
+        assert exc.value.code == 404
+        assert sleeps == []
+        assert len(http_server.gets("/missing")) == 1
+
+    def test_follows_relative_redirect(self, http_server):
+        http_server.files["/new/1"] = b"moved"
+        http_server.script["/old/1"] = [(301, {"Location": "../new/1"}, b"")]
+        assert _get(http_server, "/old/1") == b"moved"
+        assert [r.path for r in http_server.requests] == ["/old/1", "/new/1"]
+
+    def test_reuses_connection(self, http_server):
+        http_server.files["/obj/1"] = b"a"
+        http_server.files["/obj/2"] = b"b"
+        _get(http_server, "/obj/1")
+        _get(http_server, "/obj/2")
+        assert len({r.client_port for r in http_server.requests}) == 1
+
+
+class TestFetchAll:
+    def test_yields_results_and_errors_in_order(self, http_server):
+        for n in range(5):
+            http_server.files[f"/obj/{n}"] = str(n).encode()
+        urls = [f"{http_server.url}/obj/{n}" for n in (0, 1, 9, 2, 3, 4)]
+        results = list(
+            fetch_all(lambda url: fetch_bytes(Request(url), timeout=5), urls, concurrency=3)
+        )
+        assert [url for url, _ in results] == urls
+        assert [r for _, r in results if isinstance(r, bytes)] == [b"0", b"1", b"2", b"3", b"4"]
+        assert isinstance(results[2][1], HTTPError)
@@ -0,0 +1,175 @@
+"""Tests for the Getty ingester: reparse, stale object selection and object fetches."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+
+from artdig.getty import ingest as getty
+from artdig.getty.ingest import OBJECT_PREFIX, GettyIngester
+
+
+def _object(uuid: str, title: str) -> dict:
+    return {
+        "id": OBJECT_PREFIX + uuid,
+        "type": "HumanMadeObject",
+        "_label": f"label {uuid}",
+        "identified_by": [
+            {"type": "Name", "content": title,
+             "classified_as": [{"_label": "preferred terms"}]},
+            {"type": "Identifier", "content": f"{uuid}.PA.1",
+             "classified_as": [{"_label": "Accession Number"}]},
+        ],
+        "produced_by": {"timespan": {"begin_of_the_begin": "1889-01-01T00:00:00"}},
+    }
+
+
+@pytest.fixture
+def ingester(conn) -> GettyIngester:
+    return GettyIngester(conn)
+
+
+def _store_raw(ingester: GettyIngester, obj: dict, fetched_at: datetime):
+    """A getty_objects row as an older parser left it: raw JSON, stale columns."""
+    ingester.conn.execute(
+        "INSERT INTO getty_objects (object_url, fetched_at, raw) VALUES (?, ?, ?)",
+        [obj["id"], fetched_at, json.dumps(obj)],
+    )
+
+
+# ---------------------------------------------------------------------------
+# reparse
+# ---------------------------------------------------------------------------
+
+
+class TestReparse:
+    def test_rederives_columns_and_keeps_fetched_at(self, ingester: GettyIngester):
+        fetched = datetime(2024, 1, 2, 3, 4, 5)
+        _store_raw(ingester, _object("a1", "Irises"), fetched)
+        ingester.reparse()
+        row = ingester.conn.execute("""
+            SELECT object_uuid, title, accession_number, date_begin, fetched_at
+            FROM getty_objects
+        """).fetchone()
+        assert row == ("a1", "Irises", "a1.PA.1", 1889, fetched)
+
+    def test_pages_through_all_objects(self, ingester: GettyIngester, monkeypatch):
+        monkeypatch.setattr(getty, "FLUSH_EVERY", 2)
+        for n in range(5):
+            _store_raw(ingester, _object(f"u{n}", f"Title {n}"), datetime(2024, 1, 1))
+        ingester.reparse()
+        titles = ingester.conn.execute(
+            "SELECT title FROM getty_objects ORDER BY object_url"
+        ).fetchall()
+        assert titles == [(f"Title {n}",) for n in range(5)]
+
+
+class TestFlush:
+    def test_repeated_object_keeps_last_version(self, ingester: GettyIngester):
+        ingester._queue_object(_object("a1", "Draft"))
+        ingester._queue_object(_object("a1", "Final"))
+        ingester._flush()
+        ingester._queue_object(_object("a1", "Revised"))
+        ingester._flush()
+        assert ingester.conn.execute("SELECT title FROM getty_objects").fetchall() == [
+            ("Revised",)
+        ]
+
+
+# ---------------------------------------------------------------------------
+# stale_object_urls
+# ---------------------------------------------------------------------------
+
+
+def _activity(ingester: GettyIngester, page: int, object_url: str, event_time: str | None):
+    ingester.conn.execute(
+        "INSERT INTO getty_activity (activity_id, page_number, event_time, object_url) "
+        "VALUES (uuid()::VARCHAR, ?, ?, ?)",
+        [page, event_time, object_url],
+    )
+
+
+class TestStaleObjectUrls:
+    def test_selects_objects_needing_fetch(self, ingester: GettyIngester):
+        fetched = datetime(2024, 6, 1)
+        for uuid in ("fresh", "updated", "no-time"):
+            _store_raw(ingester, _object(uuid, uuid), fetched)
+        _activity(ingester, 1, OBJECT_PREFIX + "fresh", "2024-05-01T00:00:00")
+        # Only the latest event counts.
+        _activity(ingester, 1, OBJECT_PREFIX + "updated", "2024-05-01T00:00:00")
+        _activity(ingester, 2, OBJECT_PREFIX + "updated", "2024-07-01T00:00:00")
+        _activity(ingester, 2, OBJECT_PREFIX + "missing", "2024-05-01T00:00:00")
+        _activity(ingester, 2, OBJECT_PREFIX + "no-time", None)
+        assert ingester.stale_object_urls(1, 2) == [
+            OBJECT_PREFIX + "missing", OBJECT_PREFIX + "no-time", OBJECT_PREFIX + "updated"
+        ]
+
+    def test_limits_to_page_range(self, ingester: GettyIngester):
+        _activity(ingester, 1, OBJECT_PREFIX + "p1", "2024-05-01T00:00:00")
+        _activity(ingester, 3, OBJECT_PREFIX + "p3", "2024-05-01T00:00:00")
+        assert ingester.stale_object_urls(2, 3) == [OBJECT_PREFIX + "p3"]
+
+    def test_ignores_non_object_urls(self, ingester: GettyIngester):
+        _activity(ingester, 1, "https://data.getty.edu/museum/collection/person/x", None)
+        _activity(ingester, 1, None, None)
+        assert ingester.stale_object_urls(1, 1) == []
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+
+def _serve_object(http_server, name: str, body: bytes | None = None) -> str:
+    url = f"{http_server.url}/object/{name}"
+    payload = {"id": url, "type": "HumanMadeObject", "_label": name}
+    if body is None:
+        body = json.dumps(payload).encode()
+    http_server.files[f"/object/{name}"] = body
+    return url
+
+
+def _index(ingester: GettyIngester, *urls: str):
+    for url in urls:
+        ingester.conn.execute(
+            "INSERT INTO getty_object_index (object_url, indexed_at) VALUES (?, now())", [url]
+        )
+
+
+class TestHydratePending:
+    def test_records_invalid_json_as_error(self, ingester: GettyIngester, http_server):
+        good = _serve_object(http_server, "good")
+        bad = _serve_object(http_server, "bad", b"<html>oops</html>")
+        _index(ingester, good, bad)
+        assert ingester.hydrate_pending_objects(limit=10, sleep_seconds=0) == (1, 1)
+        status = dict(ingester.conn.execute(
+            "SELECT object_url, status FROM getty_object_index"
+        ).fetchall())
+        assert status == {good: "done", bad: "error"}
+        assert ingester.conn.execute("SELECT label FROM getty_objects").fetchall() == [("good",)]
+
+    def test_error_keeps_fetched_objects(self, ingester: GettyIngester, http_server):
+        first = _serve_object(http_server, "a-first")
+        # Valid JSON but not an object: _queue_object fails on it.
+        broken = _serve_object(http_server, "b-list", b"[1, 2]")
+        _index(ingester, first, broken)
+        with pytest.raises(AttributeError):
+            ingester.hydrate_pending_objects(limit=10, sleep_seconds=0, concurrency=1)
+        assert ingester.conn.execute("SELECT object_url FROM getty_objects").fetchall() == [
+            (first,)
+        ]
+        assert ingester.conn.execute(
+            "SELECT status FROM getty_object_index WHERE object_url = ?", [first]
+        ).fetchone() == ("done",)
+
+
+class TestIngestObjects:
+    def test_skips_invalid_json(self, ingester: GettyIngester, http_server):
+        good = _serve_object(http_server, "good")
+        bad = _serve_object(http_server, "bad", b"{truncated")
+        ingester.ingest_objects([bad, good], max_objects=None, sleep_seconds=0)
+        assert ingester.conn.execute("SELECT object_url FROM getty_objects").fetchall() == [
+            (good,)
+        ]
@@ -0,0 +1,203 @@
+"""Tests for the Rijks LIDO dump ingest and the raw_xml BLOB migration."""
+
+from __future__ import annotations
+
+import io
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from artdig.rijks import ingest as rijks
+from artdig.rijks.lido import LIDORecord
+
+
+def _record(n: int, work_id: str | None = None, prefix: str = "lido:") -> str:
+    work_id = f"SK-A-{n}" if work_id is None else work_id
+    repository = (
+        f"<lido:repositoryWrap><lido:repositorySet><lido:workID>{work_id}</lido:workID>"
+        "</lido:repositorySet></lido:repositoryWrap>"
+        if work_id
+        else ""
+    )
+    record = f"""<lido:lido>
+  <lido:lidoRecID lido:type="local">NL-AsdRM/lido/{n}</lido:lidoRecID>
+  <lido:descriptiveMetadata xml:lang="nl">
+    <lido:objectIdentificationWrap>
+      <lido:titleWrap><lido:titleSet>
+        <lido:appellationValue xml:lang="en">Title {n}</lido:appellationValue>
+        <lido:appellationValue xml:lang="nl">Titel {n}</lido:appellationValue>
+      </lido:titleSet></lido:titleWrap>
+      {repository}
+    </lido:objectIdentificationWrap>
+  </lido:descriptiveMetadata>
+</lido:lido>
+"""
+    return record.replace("lido:", prefix)
+
+
+def _lido_xml(
+    *records: str,
+    root: str = '<lido:lidoWrap xmlns:lido="http://www.lido-schema.org" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">',
+) -> bytes:
+    tag = root[1:].split()[0]
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n{root}\n' + "".join(records) + f"</{tag}>\n"
+    ).encode()
+
+
+def _inventory_numbers(xml: bytes, batch_size: int = 10) -> list[str]:
+    return [
+        row["inventory_number"]
+        for chunk in rijks._iter_lido_chunks(io.BytesIO(xml), batch_size)
+        for row in rijks._parse_lido_chunk(chunk)[0]
+    ]
+
+
+@pytest.fixture
+def lido_zip(tmp_path: Path) -> Path:
+    path = tmp_path / "lido.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("lido.xml", _lido_xml(_record(1), _record(2), _record(3, ""), _record(4)))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Chunking and parsing
+# ---------------------------------------------------------------------------
+
+
+class TestLidoChunks:
+    def test_chunks_parse_standalone(self):
+        xml = _lido_xml(*(_record(n) for n in range(1, 6)))
+        # A tiny read size cuts records across reads.
+        chunks = list(rijks._iter_lido_chunks(io.BytesIO(xml), batch_size=2, read_size=37))
+        assert len(chunks) == 3
+        numbers = [
+            [row["inventory_number"] for row in rijks._parse_lido_chunk(chunk)[0]]
+            for chunk in chunks
+        ]
+        assert numbers == [["SK-A-1", "SK-A-2"], ["SK-A-3", "SK-A-4"], ["SK-A-5"]]
+
+    def test_parse_skips_records_without_work_id(self):
+        (chunk,) = rijks._iter_lido_chunks(io.BytesIO(_lido_xml(_record(1), _record(2, ""))), 10)
+        rows, skipped = rijks._parse_lido_chunk(chunk)
+        assert skipped == 1
+        (row,) = rows
+        assert row["lido_rec_id"] == "NL-AsdRM/lido/1"
+        assert (row["title_en"], row["title_nl"]) == ("Title 1", "Titel 1")
+        assert row["source_url"] == "https://www.rijksmuseum.nl/nl/collectie/SK-A-1"
+
+    def test_default_namespace(self):
+        root = '<lidoWrap xmlns="http://www.lido-schema.org">'
+        xml = _lido_xml(_record(1, prefix=""), _record(2, prefix=""), root=root)
+        assert _inventory_numbers(xml, batch_size=1) == ["SK-A-1", "SK-A-2"]
+
+    def test_other_prefix(self):
+        root = '<l:lidoWrap xmlns:l="http://www.lido-schema.org">'
+        xml = _lido_xml(_record(1, prefix="l:"), root=root)
+        assert _inventory_numbers(xml) == ["SK-A-1"]
+
+    def test_schema_location_before_declaration(self):
+        root = (
+            '<lido:lidoWrap xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://www.lido-schema.org http://www.lido-schema.org/lido.xsd" '
+            'xmlns:lido="http://www.lido-schema.org">'
+        )
+        assert _inventory_numbers(_lido_xml(_record(1), root=root)) == ["SK-A-1"]
+
+    def test_prefix_declared_twice(self):
+        # Rebound by the nested wrapper: only the inner declaration may reach the chunks.
+        xml = (
+            '<wrap xmlns:lido="urn:other">'
+            '<lido:lidoWrap xmlns:lido="http://www.lido-schema.org">'
+            f"{_record(1)}{_record(2)}</lido:lidoWrap></wrap>"
+        ).encode()
+        assert _inventory_numbers(xml) == ["SK-A-1", "SK-A-2"]
+
+    def test_no_records_raises(self):
+        for xml in (_lido_xml(), _lido_xml(root="<wrap>")):
+            with pytest.raises(RuntimeError, match="No LIDO records"):
+                list(rijks._iter_lido_chunks(io.BytesIO(xml), 10))
+
+
+_CREATION = """<lido:eventWrap><lido:eventSet><lido:event>
+  <lido:eventType><lido:term xml:lang="en">creation</lido:term></lido:eventType>
+  <lido:eventMaterialsTech><lido:materialsTech>
+    <lido:termMaterialsTech lido:type="material">
+      <lido:term xml:lang="en">oil paint</lido:term>
+    </lido:termMaterialsTech>
+  </lido:materialsTech></lido:eventMaterialsTech>
+</lido:event></lido:eventSet></lido:eventWrap>
+"""
+
+
+def _lido_record(n: int, events: str = "") -> LIDORecord:
+    end = "</lido:descriptiveMetadata>"
+    record = _record(n).replace(end, events + end)
+    (el,) = ET.fromstring(_lido_xml(record))
+    return LIDORecord(el)
+
+
+class TestLIDORecord:
+    def test_materials_are_copies(self):
+        rec = _lido_record(1, _CREATION)
+        rec.materials()[0]["label_en"] = "changed"
+        rec.materials().append({})
+        assert [m["label_en"] for m in rec.materials()] == ["oil paint"]
+        assert rec.techniques() == []
+
+    def test_no_creation_event_is_memoized(self):
+        rec = _lido_record(1)
+        assert rec.materials() == []
+        assert rec._mat_tech == ((), ())
+        rec.techniques().append({})
+        assert rec.techniques() == []
+
+
+class TestIngestLido:
+    def test_ingests_zip(self, conn, lido_zip: Path):
+        rijks.RijksIngester(conn).ingest_lido(lido_zip, batch_size=2, workers=1)
+        rows = conn.execute(
+            "SELECT inventory_number, title_en FROM rijks_objects ORDER BY inventory_number"
+        ).fetchall()
+        assert rows == [("SK-A-1", "Title 1"), ("SK-A-2", "Title 2"), ("SK-A-4", "Title 4")]
+
+    def test_duplicate_inventory_numbers_keep_last(self, conn, tmp_path: Path):
+        path = tmp_path / "lido.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("lido.xml", _lido_xml(_record(1), _record(2, "SK-A-1")))
+        rijks.RijksIngester(conn).ingest_lido(path, batch_size=10, workers=1)
+        assert conn.execute("SELECT lido_rec_id FROM rijks_objects").fetchall() == [
+            ("NL-AsdRM/lido/2",)
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Schema migration
+# ---------------------------------------------------------------------------
+
+
+class TestRawXmlMigration:
+    def test_varchar_raw_xml_becomes_blob(self, conn):
+        old_ddl = re.sub(r"raw_xml\s+BLOB", "raw_xml VARCHAR", rijks.SCHEMA_DDL)
+        assert old_ddl != rijks.SCHEMA_DDL
+        conn.execute(old_ddl)
+        conn.execute(
+            "INSERT INTO rijks_objects (identifier, raw_xml) VALUES ('oai:1', '<record/>')"
+        )
+        rijks.RijksIngester(conn)
+        typ, raw = conn.execute(
+            "SELECT typeof(raw_xml), raw_xml FROM rijks_objects"
+        ).fetchone()
+        assert typ == "BLOB"
+        assert rijks._inflate_xml(raw) == "<record/>"
+
+    def test_deflated_round_trip(self):
+        xml = "<record>" + "x" * 1000 + "</record>"
+        raw = rijks._deflate_xml(xml)
+        assert len(raw) < len(xml)
+        assert rijks._inflate_xml(raw) == xml